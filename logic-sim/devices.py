@@ -24,6 +24,11 @@ class Device:
     No public methods.
     """
 
+    __slots__ = ('device_id', 'inputs', 'outputs', 'device_kind',
+                 'clock_half_period', 'clock_counter', 'switch_state',
+                 'dtype_memory', 'siggen_waveform', 'siggen_counter',
+                 'siggen_startup')
+
     def __init__(self, device_id):
         """Initialise device properties."""
 
@@ -62,6 +67,9 @@ class Devices:
     get_device(self, device_id): Returns the Device object corresponding
                                  to the device ID.
 
+    has_device(self, device_id): Returns True if a device with the device ID
+                                 exists.
+
     find_devices(self, device_kind=None): Returns a list of device_ids of
                                           the specified device_kind.
 
@@ -109,6 +117,8 @@ class Devices:
         self.names = names
 
         self.devices_list = []
+        # Stores {device_id: device} for looking up devices by ID
+        self.devices_dictionary = {}
 
         gate_strings = ["AND", "OR", "NAND", "NOR", "XOR"]
         device_strings = ["CLOCK", "SWITCH", "DTYPE", "SIGGEN"]
@@ -134,10 +144,11 @@ class Devices:
 
     def get_device(self, device_id):
         """Return the Device object corresponding to device_id."""
-        for device in self.devices_list:
-            if device.device_id == device_id:
-                return device
-        return None
+        return self.devices_dictionary.get(device_id)
+
+    def has_device(self, device_id):
+        """Return True if a device with device_id exists."""
+        return device_id in self.devices_dictionary
 
     def find_devices(self, device_kind=None):
         """Return a list of device IDs of the specified device_kind.
@@ -158,6 +169,7 @@ class Devices:
         new_device = Device(device_id)
         new_device.device_kind = device_kind
         self.devices_list.append(new_device)
+        self.devices_dictionary.setdefault(device_id, new_device)
 
     def add_input(self, device_id, input_id):
         """Add the specified input to the specified device.
@@ -324,7 +336,7 @@ class Devices:
         Return self.NO_ERROR if successful. Return corresponding error if not.
         """
         # Device has already been added to the devices_list
-        if self.get_device(device_id) is not None:
+        if device_id in self.devices_dictionary:
             error_type = self.DEVICE_PRESENT
 
         elif device_kind == self.SWITCH:
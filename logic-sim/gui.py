@@ -9,16 +9,15 @@ MyGLCanvas_2D - handles all canvas drawing operations.
 Gui - configures the main window and all the widgets.
 """
 import sys
-import os
+import functools
+from itertools import repeat
 
 import wx
 import wx.adv
-import wx.glcanvas as wxcanvas
 import wx.dataview as dv
 import wx.lib.mixins.listctrl as listmix
 import wx.lib.langlistctrl as langlc
 from wx.lib.wordwrap import wordwrap
-from OpenGL import GL, GLUT
 
 from names import Names
 from devices import Devices
@@ -26,7 +25,6 @@ from network import Network
 from monitors import Monitors
 from scanner import Scanner
 from parse import Parser
-from myglcanvas import MyGLCanvasWrapper, MyGLCanvas_2D, MyGLCanvas_3D
 
 from contextlib import redirect_stdout
 import io
@@ -49,6 +47,30 @@ def _displayHook(obj):
 builtins.__dict__['_'] = wx.GetTranslation
 
 
+@functools.lru_cache(maxsize=None)
+def _load_bitmap(path):
+    """Return the wx.Bitmap stored at path, decoding each file only once."""
+    return wx.Bitmap(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_icon(path):
+    """Return the wx.Icon stored at path, decoding each file only once."""
+    return wx.Icon(path)
+
+
+@functools.lru_cache(maxsize=16)
+def _language_flag(lang):
+    """Return the flag bitmap of the wx language identifier lang."""
+    return langlc.GetLanguageFlag(lang)
+
+
+@functools.lru_cache(maxsize=16)
+def _lang_short(lang):
+    """Return the two letter code of the wx language identifier lang."""
+    return wx.Locale.GetLanguageCanonicalName(lang)[:2]
+
+
 class Gui(wx.Frame):
     """Configure the main window and all the widgets.
 
@@ -128,8 +150,9 @@ class Gui(wx.Frame):
         self.locale = None
         wx.Locale.AddCatalogLookupPathPrefix('locale')
         sys_lang = wx.Locale.GetSystemLanguage()
-        lang_name = wx.Locale.GetLanguageCanonicalName(sys_lang)
-        self.update_language(lang_name[:2])
+        self.update_language(_lang_short(sys_lang))
+        # Language the widget labels were last translated to
+        self._last_lang = self.locale.GetLanguage()
 
         # Add fonts
         self.NORMAL_FONT = wx.TextAttr()
@@ -137,6 +160,8 @@ class Gui(wx.Frame):
             'BLACK', font=wx.Font(
                 wx.FontInfo(10).Family(
                     wx.FONTFAMILY_TELETYPE)))
+        # Style currently applied to new text in the activity log
+        self._log_style = self.NORMAL_FONT
 
         # Add IDs for menu and toolbar items
         self.ID_OPEN = 1001
@@ -150,6 +175,19 @@ class Gui(wx.Frame):
         self.ID_LANG = 1009
         self.ID_RELOAD = 1010
 
+        # Map menu and toolbar IDs to their handlers for on_menu
+        self._menu_dispatch = {
+            self.ID_OPEN: self.on_open,  # file dialog
+            self.ID_RUN: self.on_run,  # run button
+            self.ID_CONTINUE: self.on_continue,  # continue button
+            self.ID_CENTER: self.on_center,  # center button
+            self.ID_HELP: self.on_help,  # help button
+            self.ID_CLEAR: self.clear_log,  # clear button
+            self.ID_TOGGLE_3D: self.on_toggle_3d_vew,  # toggle 3D view button
+            self.ID_LANG: self.on_lang_change,
+            self.ID_RELOAD: self.on_reload,
+        }
+
         # Configure the file menu
         fileMenu = wx.Menu()
         viewMenu = wx.Menu()
@@ -183,17 +221,17 @@ class Gui(wx.Frame):
         self.SetMenuBar(menuBar)
 
         # Load icons
-        appIcon = wx.Icon("res/cylinder.png")
+        appIcon = _load_icon("res/cylinder.png")
         self.SetIcon(appIcon)
-        openIcon = wx.Bitmap("res/open_mat.png")
-        reloadIcon = wx.Bitmap("res/reload_mat.png")
-        centerIcon = wx.Bitmap("res/center_mat.png")
-        runIcon = wx.Bitmap("res/run.png")
-        continueIcon = wx.Bitmap("res/continue_mat.png")
-        infoIcon = wx.Bitmap("res/info_mat_outline.png")
-        self.layout2dIcon = wx.Bitmap("res/layout2d.png")
-        self.layout3dIcon = wx.Bitmap("res/layout3d.png")
-        flagIcon = langlc.GetLanguageFlag(self.locale.GetLanguage())
+        openIcon = _load_bitmap("res/open_mat.png")
+        reloadIcon = _load_bitmap("res/reload_mat.png")
+        centerIcon = _load_bitmap("res/center_mat.png")
+        runIcon = _load_bitmap("res/run.png")
+        continueIcon = _load_bitmap("res/continue_mat.png")
+        infoIcon = _load_bitmap("res/info_mat_outline.png")
+        self.layout2dIcon = _load_bitmap("res/layout2d.png")
+        self.layout3dIcon = _load_bitmap("res/layout3d.png")
+        flagIcon = _language_flag(self.locale.GetLanguage())
 
         # Configure toolbar
         # Keep a reference to the toolBar to update its icons
@@ -221,12 +259,17 @@ class Gui(wx.Frame):
 
         # State variables
         self.current_file_path = None # set current file path
+        self._open_dialog = None  # file dialog, created on first use
         self.parse_success = False # prevents run and continue if parse fails
         self.canvas_mode = '2d'  # current display mode of canvas
         self.cycles_completed = 0  # number of simulation cycles completed
 
-        # Canvas for drawing signals
-        self.canvas = MyGLCanvasWrapper(self)
+        # Canvas for drawing signals. OpenGL is only set up once the window
+        # is on screen; until then a plain panel holds the canvas' place.
+        self._canvas = None
+        self.canvas_placeholder = wx.Panel(self)
+        self.canvas_placeholder.Bind(wx.EVT_PAINT,
+                                     self._on_canvas_placeholder_paint)
 
         # Configure the widgets
         self.activity_log = wx.TextCtrl(
@@ -245,7 +288,7 @@ class Gui(wx.Frame):
         right_sizer = wx.BoxSizer(wx.VERTICAL)
         left_sizer = wx.BoxSizer(wx.VERTICAL)
 
-        left_sizer.Add(self.canvas, 3, wx.EXPAND | wx.ALL, 5)
+        left_sizer.Add(self.canvas_placeholder, 3, wx.EXPAND | wx.ALL, 5)
         left_sizer.Add(self.activity_log_label,
                        0.2, wx.EXPAND | wx.ALL, 5)
         left_sizer.Add(self.activity_log, 1, wx.EXPAND | wx.ALL, 5)
@@ -258,6 +301,33 @@ class Gui(wx.Frame):
         self.SetSizeHints(1200, 800)
         self.SetSizer(main_sizer)
 
+    @property
+    def canvas(self):
+        """Return the signal canvas, see _create_canvas()."""
+        return self._create_canvas()
+
+    def _create_canvas(self):
+        """Swap the placeholder for the signal canvas, unless already done,
+        and return the canvas.
+
+        The OpenGL modules are imported and the GL context is created here
+        rather than in __init__, so that the window can be shown first.
+        """
+        if self._canvas is None:
+            from myglcanvas import MyGLCanvasWrapper
+            self._canvas = MyGLCanvasWrapper(self)
+            self.canvas_placeholder.GetContainingSizer().Replace(
+                self.canvas_placeholder, self._canvas)
+            self.canvas_placeholder.Destroy()
+            self.Layout()
+        return self._canvas
+
+    def _on_canvas_placeholder_paint(self, event):
+        """Swap the placeholder for the real canvas on its first paint."""
+        wx.PaintDC(self.canvas_placeholder)
+        # The placeholder cannot be destroyed inside its own paint handler
+        wx.CallAfter(self._create_canvas)
+
     def make_right_sizer(self):
         """Helper function that creates the right sizer"""
         right_sizer = wx.BoxSizer(wx.VERTICAL)
@@ -291,10 +361,7 @@ class Gui(wx.Frame):
 
         """
         # if an unsupported language is requested default to English
-        if lang in appC.supLang:
-            selLang = appC.supLang[lang]
-        else:
-            selLang = wx.LANGUAGE_ENGLISH
+        selLang = appC.supLang.get(lang, wx.LANGUAGE_ENGLISH)
 
         if self.locale:
             assert sys.getrefcount(self.locale) <= 2
@@ -310,7 +377,14 @@ class Gui(wx.Frame):
     def update_texts(self):
         """Updates the text fields around the application after a change
         of locale.
+
+        Nothing is updated if the language has not changed since the labels
+        were last translated.
         """
+        lang = self.locale.GetLanguage()
+        if lang == self._last_lang:
+            return
+        self._last_lang = lang
 
         # Update menu items
         # WARNING: This update assumes a certain order of menus
@@ -348,7 +422,7 @@ class Gui(wx.Frame):
         # TODO
 
         # Update flag icon
-        flagIcon = langlc.GetLanguageFlag(self.locale.GetLanguage())
+        flagIcon = _language_flag(lang)
         self.GetToolBar().SetToolNormalBitmap(self.ID_LANG, flagIcon)
 
         # Update right panel
@@ -370,17 +444,14 @@ class Gui(wx.Frame):
         switch_ids = self.devices.find_devices(self.devices.SWITCH)
         switch_names = [self.names.get_name_string(
             sw_id) for sw_id in switch_ids]
-        switch_signals = [self.devices.get_device(
-            sw_id).switch_state for sw_id in switch_ids]
-        switch_states = [
-            True if sig in [
-                self.devices.HIGH,
-                self.devices.RISING] else False for sig in switch_signals]
+        on_signals = {self.devices.HIGH, self.devices.RISING}
+        switch_states = [self.devices.get_device(sw_id).switch_state in
+                         on_signals for sw_id in switch_ids]
 
         # Reset tab elements
         self.monitor_tab.clear()
-        self.monitor_tab.append(list(zip(mons, [True for i in mons])))
-        self.monitor_tab.append(list(zip(non_mons, [False for i in non_mons])))
+        self.monitor_tab.append(list(zip(mons, repeat(True))))
+        self.monitor_tab.append(list(zip(non_mons, repeat(False))))
         self.switch_tab.clear()
         self.switch_tab.append(list(zip(switch_names, switch_states)))
 
@@ -394,18 +465,14 @@ class Gui(wx.Frame):
                    and False to deactivate
         """
         # Split the monitor to device name and port name if it exists
-        splt = monitor_name.split('.')
-        if len(splt) == 1:
-            # No port given
-            device_id = self.names.query(splt[0])
-            port_id = None
-        elif len(splt) == 2:
-            # Port given
-            device_id = self.names.query(splt[0])
-            port_id = self.names.query(splt[1])
-        else:
-            # TODO: Print error
-            pass
+        device_name, dot, port_name = monitor_name.partition('.')
+        if '.' in port_name:
+            # TODO: Reformat error text for consistency with parser
+            self.log_message(
+                _("Error: Monitor {} not found.").format(monitor_name))
+            return
+        device_id = self.names.query(device_name)
+        port_id = self.names.query(port_name) if dot else None
 
         if device_id is None:
             # TODO: Reformat error text for consistency with parser
@@ -475,14 +542,17 @@ class Gui(wx.Frame):
 
     def log_message(self, text, style=None, no_new_line=False):
         """Add message to the activity log."""
-        if style is not None:
+        if style is None:
+            style = self.NORMAL_FONT
+        # Only change the style of the log when it differs from the last one
+        if style is not self._log_style:
             self.activity_log.SetDefaultStyle(style)
+            self._log_style = style
         if no_new_line:
             self.activity_log.AppendText(str(text))
         else:
             self.activity_log.AppendText("\n" + str(text))
         self.activity_log.ShowPosition(self.activity_log.GetLastPosition())
-        self.activity_log.SetDefaultStyle(self.NORMAL_FONT)
 
     #################
     # author: Jorge #
@@ -524,11 +594,19 @@ class Gui(wx.Frame):
     def on_open(self):
         """Open the file browser and parse the file chosen."""
         text = _("Open file dialog.")
-        openFileDialog = wx.FileDialog(
-            self,
-            _("Open"),
-            wildcard="Circuit Definition files (*.txt;*.lcdf)|*.txt;*.lcdf",
-            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        # The dialog is created once and reused; as a child of the frame it
+        # is destroyed together with it.
+        if self._open_dialog is None:
+            self._open_dialog = wx.FileDialog(
+                self,
+                _("Open"),
+                wildcard="Circuit Definition files (*.txt;*.lcdf)|"
+                         "*.txt;*.lcdf",
+                style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        openFileDialog = self._open_dialog
+        if self.current_file_path is not None:
+            # Start from the last opened file
+            openFileDialog.SetPath(self.current_file_path)
         res = openFileDialog.ShowModal()
         if res == wx.ID_OK:  # user selected a file
             self.current_file_path = openFileDialog.GetPath()
@@ -610,50 +688,50 @@ class Gui(wx.Frame):
         """Shows a help window with user instructions."""
         help_title = _("Help - Program controls ")
         # TODO Find a more elegant way to provide localisation for this text
-        help_content = ("" +
-                        _("Shortcuts: \n") +
-                        _("Ctrl + O: Open file\n") +
-                        _("Ctrl + H: Help\n") +
-                        _("Ctrl + R: Run\n") +
-                        _("Ctrl + Shift + C: Continue\n") +
-                        _("Ctrl + E: Center canvas\n") +
-                        _("Ctrl + T: Toggle 2D/3D view\n") +
-                        _("Ctrl + L: Clear activity log\n\n") +
-                        _("User Instructions:\n") +
-                        _("Use the Open file button to select ") +
-                        _("the desired circuit defnition file.") +
-                        _("If the file contains no errors the activity") +
-                        _(" log at the bottom of the window") +
-                        _("will read \"Succesfully parsed network\". ") +
-                        _("If there are errors, the activity log") +
-                        _("will read \"Failed to parse network\".\n\n") +
-                        _("If the network was parsed correctly it can be"
-                            "ran. ") +
-                        _("Use the plus and minus on the") +
-                        _("cycle selector to select the desired number") +
-                        _(" of cycles for the simulation or") +
-                        _("type in th desired number. Press the Run ") +
-                        _("button to run the simulator for the number") +
-                        _("of cycles selected and display the waveforms ") +
-                        _("at the current monitor points (from a") +
-                        _("cold-startup of the circuit). Press the ") +
-                        _("Continue button to run the simulator") +
-                        _("for an additional number of cycles as selected ") +
-                        _("in the cycle selector and") +
-                        _("display the waveforms at the current monitor "
-                            "points.\n\n") +
-                        _("The canvas can be restored to its default state ") +
-                        _("of position and zoomby") +
-                        _("selecting the center button.\n\n") +
-                        _("Different monitor points can be set ") +
-                        _("and zapped by first selecting the") +
-                        _("Monitors tab on the right panel, and then ") +
-                        _("selecting the desired monitor") +
-                        _("point from the list.\n\n") +
-                        _("Switches can be operated by first selecting ") +
-                        _("the Switches tab on the right") +
-                        _("panel, and then selecting the desired switches.")
-                        )
+        help_content = "".join([
+            _("Shortcuts: \n"),
+            _("Ctrl + O: Open file\n"),
+            _("Ctrl + H: Help\n"),
+            _("Ctrl + R: Run\n"),
+            _("Ctrl + Shift + C: Continue\n"),
+            _("Ctrl + E: Center canvas\n"),
+            _("Ctrl + T: Toggle 2D/3D view\n"),
+            _("Ctrl + L: Clear activity log\n\n"),
+            _("User Instructions:\n"),
+            _("Use the Open file button to select "),
+            _("the desired circuit defnition file."),
+            _("If the file contains no errors the activity"),
+            _(" log at the bottom of the window"),
+            _("will read \"Succesfully parsed network\". "),
+            _("If there are errors, the activity log"),
+            _("will read \"Failed to parse network\".\n\n"),
+            _("If the network was parsed correctly it can be"
+              "ran. "),
+            _("Use the plus and minus on the"),
+            _("cycle selector to select the desired number"),
+            _(" of cycles for the simulation or"),
+            _("type in th desired number. Press the Run "),
+            _("button to run the simulator for the number"),
+            _("of cycles selected and display the waveforms "),
+            _("at the current monitor points (from a"),
+            _("cold-startup of the circuit). Press the "),
+            _("Continue button to run the simulator"),
+            _("for an additional number of cycles as selected "),
+            _("in the cycle selector and"),
+            _("display the waveforms at the current monitor "
+              "points.\n\n"),
+            _("The canvas can be restored to its default state "),
+            _("of position and zoomby"),
+            _("selecting the center button.\n\n"),
+            _("Different monitor points can be set "),
+            _("and zapped by first selecting the"),
+            _("Monitors tab on the right panel, and then "),
+            _("selecting the desired monitor"),
+            _("point from the list.\n\n"),
+            _("Switches can be operated by first selecting "),
+            _("the Switches tab on the right"),
+            _("panel, and then selecting the desired switches."),
+        ])
 
         wx.MessageBox(help_content,
                       help_title, wx.ICON_INFORMATION | wx.OK)
@@ -687,8 +765,7 @@ class Gui(wx.Frame):
         sel_lang = dlg.GetLangSelected()
         if val == wx.ID_OK:
             # User pressed OK
-            self.update_language(
-                wx.Locale.GetLanguageCanonicalName(sel_lang)[:2])
+            self.update_language(_lang_short(sel_lang))
             self.update_texts()
 
         dlg.Destroy()
@@ -707,29 +784,14 @@ class Gui(wx.Frame):
     def on_menu(self, event):
         """Handle the event when the user selects a menu item."""
         Id = event.GetId()
-        if Id == wx.ID_EXIT:
+        handler = self._menu_dispatch.get(Id)
+        if handler is not None:
+            handler()
+        elif Id == wx.ID_EXIT:
             self.Close(True)
         elif Id == wx.ID_ABOUT:
             wx.MessageBox(_("Logic Simulator\nCreated by Psylinders\n2019"),
                           _("About Logsim"), wx.ICON_INFORMATION | wx.OK)
-        elif Id == self.ID_OPEN:  # file dialog
-            self.on_open()
-        elif Id == self.ID_RUN:  # run button
-            self.on_run()
-        elif Id == self.ID_CONTINUE:  # continue button
-            self.on_continue()
-        elif Id == self.ID_CENTER:  # center button
-            self.on_center()
-        elif Id == self.ID_HELP:  # help button
-            self.on_help()
-        elif Id == self.ID_CLEAR:  # help button
-            self.clear_log()
-        elif Id == self.ID_TOGGLE_3D:  # togge 3D view button
-            self.on_toggle_3d_vew()
-        elif Id == self.ID_LANG:
-            self.on_lang_change()
-        elif Id == self.ID_RELOAD:
-            self.on_reload()
 
     def on_size(self, event):
         """Handle the event when the window resizes."""
@@ -817,12 +879,13 @@ class CustomTab(wx.Panel):
 
     def append(self, name_list):
         """Appends the name_list in the item list."""
-        CURRENT_PATH = os.path.dirname(os.path.abspath(__file__))
-        ic = wx.Icon(CURRENT_PATH + '/res/empty_circle_w1.png')
-        for cnt in range(len(name_list)):
-            i, val = name_list[cnt]
-            it = dv.DataViewIconText("" + i)
-            self.item_list.AppendItem([it, val])
+        # Redraw the list once after all the items are added
+        self.item_list.Freeze()
+        try:
+            for name, state in name_list:
+                self.item_list.AppendItem([dv.DataViewIconText(name), state])
+        finally:
+            self.item_list.Thaw()
 
 
 class LangDialog(wx.Dialog):
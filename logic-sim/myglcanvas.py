@@ -13,9 +13,197 @@ import wx
 import wx.glcanvas as wxcanvas
 import numpy as np
 import math
+import itertools
+import ctypes
+import time
 from OpenGL import GL, GLU, GLUT
 from colors import ColorScheme
 
+# Lights of the 3D canvas, which are baked into the colors of the signal
+# traces instead of being applied by OpenGL. The ambient light is OpenGL's
+# default global ambient light. There is a light from the top right and a
+# dimmer one straight on, both directional and fixed relative to the viewer.
+_AMBIENT_LIGHT = 0.2
+_LIGHT_DIRECTIONS = np.array([[1, 1, 1], [0, 0, math.sqrt(3)]],
+                             np.float32) / math.sqrt(3)
+_LIGHT_DIFFUSE = np.array([0.75, 0.5], np.float32)
+
+# Minimum time between two repaints requested by mouse events, in ms
+_FRAME_INTERVAL = 16
+
+# Colors of the 2D canvas
+_TRACE_COLOR = (0 / 255, 122 / 255, 193 / 255)  # traces are blue
+_HIGH_FILL_COLOR = (103 / 255, 218 / 255, 255 / 255)
+_RULER_COLOR = (200 / 255, 230 / 255, 255 / 255)
+_GRID_COLOR = (0.9, 0.9, 0.9)  # light grey color
+_TEXT_COLOR = (0.0, 0.0, 0.0)  # text is black
+
+
+def _rotation_matrix(angle, x, y, z):
+    """Return the 4x4 matrix of a rotation by angle degrees about the axis
+    (x, y, z), like the one applied by glRotatef.
+
+    The matrix is returned in row-major order, so it must be transposed
+    before being passed to OpenGL. A zero axis gives the identity matrix.
+    """
+    matrix = np.identity(4, np.float32)
+    axis = np.array([x, y, z], np.float32)
+    norm = np.linalg.norm(axis)
+    if norm == 0:
+        return matrix
+    x, y, z = axis / norm
+    cross = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]], np.float32)
+    angle = math.radians(angle)
+    # Rodrigues' rotation formula
+    matrix[:3, :3] += math.sin(angle) * cross + \
+        (1 - math.cos(angle)) * (cross @ cross)
+    return matrix
+
+
+def _compile_font(font):
+    """Compile the printable ASCII characters of the GLUT bitmap font into
+    display lists and return the base of the lists.
+
+    The display list of each character is at base + its character code, so
+    a whole string can be drawn with a single glCallLists call. An OpenGL
+    context must be current.
+    """
+    base = GL.glGenLists(128)
+    for code in range(32, 127):
+        GL.glNewList(base + code, GL.GL_COMPILE)
+        GLUT.glutBitmapCharacter(font, code)
+        GL.glEndList()
+    return base
+
+
+def _build_cuboid_geometry(unit_verts, x_positions, z_positions, depths,
+                           heights, half_width, out_verts):
+    """Fill out_verts with the vertices of a batch of cuboids.
+
+    unit_verts is the (V, 3) vertex array of the unit cuboid, which has its
+    base at y = 0. Cuboid i has its base centred at (x_positions[i], -6,
+    z_positions[i]), depth depths[i] and height heights[i]. out_verts must
+    have the shape (len(heights), V, 3).
+    """
+    np.multiply(unit_verts, (half_width, 1, 0.5), out=out_verts)
+    out_verts[:, :, 0] += x_positions[:, np.newaxis]
+    out_verts[:, :, 1] *= heights[:, np.newaxis]
+    out_verts[:, :, 1] -= 6
+    out_verts[:, :, 2] *= depths[:, np.newaxis]
+    out_verts[:, :, 2] += z_positions[:, np.newaxis]
+
+
+def _shade_colors(colors, normals, rotation, out_colors):
+    """Fill out_colors with the colors of a batch of lit cuboids.
+
+    colors is the (N, 3) array of the color of each cuboid, and normals the
+    (V, 3) array of the vertex normals of the unit cuboid. rotation is the
+    3x3 rotation of the scene relative to the viewer, in row-major order.
+    Each vertex gets the diffuse lighting that OpenGL would compute for it.
+    out_colors must have the shape (N, V, 3).
+    """
+    eye_normals = normals @ rotation.T
+    brightness = _AMBIENT_LIGHT + \
+        np.maximum(eye_normals @ _LIGHT_DIRECTIONS.T, 0) @ _LIGHT_DIFFUSE
+    np.multiply(colors[:, np.newaxis], brightness[:, np.newaxis],
+                out=out_colors)
+    np.minimum(out_colors, 1, out=out_colors)
+
+
+def _compute_transform(width, height, num_monitors, cycles_completed,
+                       cycle_width, monitor_spacing, ruler_height,
+                       margin_bottom, zoom, zoom_upper, pan_x, pan_y,
+                       border_left, border_bottom):
+    """Return the bounded zoom and pan of the 2D canvas and its borders.
+
+    The canvas has the given width and height, and shows num_monitors signal
+    traces of cycles_completed cycles. Returns the tuple (zoom_lower, zoom,
+    pan_x, pan_y, border_top, border_right).
+    """
+    # Allow a max number of 7 monitors to be displayed at once
+    visible_objects_height = margin_bottom + \
+        min(7, num_monitors) * monitor_spacing + ruler_height
+    zoom_lower = min(height / visible_objects_height, zoom_upper)
+    zoom = max(zoom_lower, min(zoom, zoom_upper))
+
+    border_top = border_bottom + margin_bottom + \
+        num_monitors * monitor_spacing + ruler_height / zoom
+    border_right = cycles_completed * cycle_width
+
+    # if true, some part of the signal traces is hidden (x dir)
+    allowable_pan_right = -border_right * zoom + width
+    pan_x = max(pan_x, min(allowable_pan_right, 0))
+    pan_x = min(pan_x, border_left)
+
+    # if true, some monitors are hidden (y dir)
+    allowable_pan_top = -(border_top * zoom) + height
+    pan_y = max(pan_y, min(allowable_pan_top, 0))
+    pan_y = min(pan_y, border_bottom)
+
+    return zoom_lower, zoom, pan_x, pan_y, border_top, border_right
+
+
+def _runs(mask):
+    """Return the arrays of the start and end indices of the runs of True
+    values in the boolean array mask. The end indices are not included."""
+    edges = np.diff(np.concatenate([[0], mask.view(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _equal_runs(values):
+    """Return the arrays of the start and end indices of the runs of equal
+    values in the array values. The end indices are not included, and NaN
+    values each form a run of their own."""
+    changes = np.flatnonzero(values[1:] != values[:-1]) + 1
+    length = len(values)
+    return (np.concatenate([[0], changes])[:length],
+            np.concatenate([changes, [length]])[:length])
+
+
+class _SignalArrays():
+    """Keep the recorded signals of each monitor as numpy arrays.
+
+    The arrays are extended as new cycles are recorded, so the signals of
+    each cycle are only converted once. The monitors replace the signal list
+    of each monitor when they are reset, which invalidates its array.
+
+    Parameters
+    ----------
+    No parameters.
+
+    Public methods
+    --------------
+    get(self, monitor, signal_list): Returns the signals in signal_list, the
+                                     list of the monitor, as an int8 array.
+
+    prune(self, monitors): Forgets the arrays of the monitors not in
+                           monitors.
+    """
+
+    __slots__ = ('arrays',)
+
+    def __init__(self):
+        """Initialise the dictionary of arrays."""
+        # {(device_id, output_id): (signal_list, signal_array)}
+        self.arrays = {}
+
+    def get(self, monitor, signal_list):
+        """Return the signals of the monitor as an int8 array."""
+        cached_list, signals = self.arrays.get(monitor, (None, None))
+        if cached_list is not signal_list or len(signals) > len(signal_list):
+            signals = np.empty(0, np.int8)
+        if len(signals) < len(signal_list):
+            new_signals = signal_list[len(signals):]
+            signals = np.concatenate([signals, np.fromiter(
+                new_signals, np.int8, count=len(new_signals))])
+            self.arrays[monitor] = (signal_list, signals)
+        return signals
+
+    def prune(self, monitors):
+        """Forget the arrays of the monitors that have been removed."""
+        self.arrays = {monitor: cached for monitor, cached in
+                       self.arrays.items() if monitor in monitors}
+
 
 class MyGLCanvasWrapper(wxcanvas.GLCanvas):
     """Handle toggling between 2D and 3D drawing mode.
@@ -43,6 +231,9 @@ class MyGLCanvasWrapper(wxcanvas.GLCanvas):
                          restores the state of the canvas when a new circuit
                          definition file is loaded using the gui, or when the
                          number of monitors is changed in the gui.
+
+    request_refresh(self): Schedules a repaint of the canvas, merging requests
+                           made before the repaint into one.
     """
 
     def __init__(self, parent):
@@ -57,6 +248,18 @@ class MyGLCanvasWrapper(wxcanvas.GLCanvas):
         # keep reference to parent
         self.parent = parent
 
+        # OpenGL does its own double buffering
+        self.SetDoubleBuffered(False)
+
+        # True while a repaint has been requested but has not yet happened.
+        # The repaint is triggered when the event queue is empty, but no
+        # sooner than _FRAME_INTERVAL after the previous one.
+        self._needs_redraw = False
+        self._last_refresh = 0
+        self._refresh_timer = wx.Timer(self)
+        self.Bind(wx.EVT_IDLE, self._on_idle)
+        self.Bind(wx.EVT_TIMER, self._on_refresh_timer, self._refresh_timer)
+
         # set up drawing modes
         self.draw_2D = MyGLCanvas_2D(self)  # default mode
         self.draw_3D = MyGLCanvas_3D(self)
@@ -81,13 +284,9 @@ class MyGLCanvasWrapper(wxcanvas.GLCanvas):
             self.current_mode = self.draw_3D
         else:
             # Disable 3D open Gl
-            GL.glDisable(GL.GL_COLOR_MATERIAL)
             GL.glDisable(GL.GL_CULL_FACE)
             GL.glDisable(GL.GL_DEPTH_TEST)
-            GL.glDisable(GL.GL_LIGHTING)
-            GL.glDisable(GL.GL_LIGHT0)
-            GL.glDisable(GL.GL_LIGHT1)
-            GL.glDisable(GL.GL_NORMALIZE)
+            GL.glShadeModel(GL.GL_SMOOTH)
 
             self.current_mode = self.draw_2D
 
@@ -124,6 +323,36 @@ class MyGLCanvasWrapper(wxcanvas.GLCanvas):
         MyGLCanvas_3D."""
         self.current_mode.restore_state()
 
+    def request_refresh(self):
+        """Schedule a repaint of the canvas.
+
+        Mouse events arrive much faster than frames can be drawn, so repeated
+        requests made before the repaint takes place are merged into one.
+        """
+        self._needs_redraw = True
+
+    def _on_idle(self, event):
+        """Trigger the paint event for a requested repaint, once all pending
+        events have been handled."""
+        if self._needs_redraw and not self._refresh_timer.IsRunning():
+            wait = _FRAME_INTERVAL - \
+                (time.monotonic() - self._last_refresh) * 1000
+            if wait > 0:
+                self._refresh_timer.StartOnce(math.ceil(wait))
+            else:
+                self._refresh()
+        event.Skip()
+
+    def _on_refresh_timer(self, event):
+        """Trigger the paint event for a repaint delayed by _on_idle()."""
+        self._refresh()
+
+    def _refresh(self):
+        """Trigger the paint event."""
+        self._needs_redraw = False
+        self._last_refresh = time.monotonic()
+        self.Refresh(eraseBackground=False)
+
 
 class MyGLCanvas_2D():
     """Handle all 2D drawing operations.
@@ -160,6 +389,8 @@ class MyGLCanvas_2D():
     def __init__(self, parent):
         """Initialise canvas properties and useful variables."""
         self.init = False
+        self._viewport_dirty = False  # the canvas has been resized
+        self._modelview_dirty = False  # pan, zoom or margin have changed
 
         # keep reference to parent
         self.parent = parent
@@ -191,87 +422,251 @@ class MyGLCanvas_2D():
         # Initialise variables for zooming
         self.zoom_lower = 0.8
         self.zoom_upper = 5
-        # self.zoom = 1
-        self._update_zoom_lower_bound()
         self.zoom = self.zoom_lower
+        self._recompute_transform(reset_zoom=True)
+
+        # Vertex buffer objects for the signal trace geometry, and for the
+        # grid with the number of cycles it was built for
+        self._trace_vbo = None
+        self._grid_vbo = None
+        self._grid_cycles = None
+
+        # Base of the display lists of the text font characters
+        self._font_base = None
+
+        # The signals of each monitor as an array
+        self._signal_arrays = _SignalArrays()
+
+        # Cycle number labels of the ruler, as ASCII strings, and their
+        # lengths. Label i is the number of cycle i, counting from 1.
+        self._cycle_labels = []
+        self._cycle_label_lengths = np.zeros(0, np.float32)
+
+        # Copy of the last frame drawn, in a texture attached to a
+        # framebuffer, to repaint the canvas without drawing it again when
+        # nothing has changed
+        self._frame_fbo = None
+        self._frame_texture = None
+        self._frame_size = None
+        self._dirty = True
+        # Framebuffer objects need OpenGL 3.0 or ARB_framebuffer_object.
+        # Checked once the context exists, None until then.
+        self._can_store_frame = None
+
+        # Cache of the OpenGL state, to skip redundant state changes. None
+        # means that the state is unknown, and a scissor box of None that the
+        # scissor test is disabled.
+        self._gl_state = {'viewport': None, 'color': None, 'line_width': None,
+                          'scissor': None}
 
     def init_gl(self):
         """Configure and initialise the OpenGL context."""
         size = self.parent.GetClientSize()
         self.parent.SetCurrent(self.parent.context)
+
+        # The state may have been changed elsewhere, e.g. by the 3D mode
+        self._gl_state = {'viewport': None, 'color': None, 'line_width': None,
+                          'scissor': None}
+        GL.glDisable(GL.GL_SCISSOR_TEST)
+        if self._can_store_frame is None:
+            self._can_store_frame = (bool(GL.glGenFramebuffers) and
+                                     bool(GL.glBlitFramebuffer))
+
         GL.glDrawBuffer(GL.GL_BACK)
         GL.glClearColor(1.0, 1.0, 1.0, 0.0)
-        GL.glViewport(self.margin_left, 0, size.width - self.margin_left,
-                      size.height)
+        self._update_viewport(size)
+        self._update_modelview(size)
+
+    def _update_viewport(self, size):
+        """Update the viewport and projection matrix to the canvas size."""
+        self._set_viewport(0, 0, size.width, size.height)
         GL.glMatrixMode(GL.GL_PROJECTION)
         GL.glLoadIdentity()
         GL.glOrtho(0, size.width, 0, size.height, -1, 1)
         GL.glMatrixMode(GL.GL_MODELVIEW)
-        GL.glLoadIdentity()
-        GL.glTranslated(self.pan_x, self.pan_y, 0.0)
-        GL.glScaled(self.zoom, self.zoom, self.zoom)
+        self._viewport_dirty = False
+
+    def _update_modelview(self, size):
+        """Load the modelview matrix built from the margin, pan and zoom."""
+        # The traces are panned and zoomed, then squeezed horizontally into
+        # the area right of the left margin
+        squeeze = self._trace_area_width(size) / max(size.width, 1)
+        zoom = self.zoom
+        GL.glMatrixMode(GL.GL_MODELVIEW)
+        # Column-major order, as OpenGL expects
+        GL.glLoadMatrixd((squeeze * zoom, 0.0, 0.0, 0.0,
+                          0.0, zoom, 0.0, 0.0,
+                          0.0, 0.0, zoom, 0.0,
+                          self.margin_left + squeeze * self.pan_x,
+                          self.pan_y, 0.0, 1.0))
+        self._modelview_dirty = False
 
     def render(self, text):
         """Handle all drawing operations."""
-        # Update pan and zoom variables
-        self._update_zoom_lower_bound()
-        self._bound_zooming()
-        self._update_borders()
-        self._bound_panning()
+        monitors = self.parent.parent.monitors
+        monitors_dictionary = monitors.monitors_dictionary
+        devices = self.parent.parent.devices
+
+        # Set the left margin for the canvas
+        margin = monitors.get_margin()
+        if margin is not None:
+            margin_left = margin * self.character_width + 10
+            if margin_left != self.margin_left:
+                self.margin_left = margin_left
+                self._modelview_dirty = True
 
         self.parent.SetCurrent(self.parent.context)
         if not self.init:
             # Configure the viewport, modelview and projection matrices
             self.init_gl()
             self.init = True
+        else:
+            self._update_matrices()
 
         # Clear everything
+        self._set_scissor(None)
         GL.glClear(GL.GL_COLOR_BUFFER_BIT)
 
+        if not monitors_dictionary and \
+                self.parent.parent.cycles_completed == 0:
+            # Nothing to draw. The blank frame is not stored, as clearing the
+            # canvas is as fast as copying it.
+            self._dirty = True
+            GL.glFlush()
+            self.parent.SwapBuffers()
+            return
+
         # Enable line below only when debugging the canvas
         # self.render_text(text, 10, 10)
 
-        # Set the left margin for the canvas
-        if self.parent.parent.monitors.get_margin() is not None:
-            self.margin_left = (
-                self.parent.parent.monitors.get_margin() *
-                self.character_width +
-                10)
-
         size = self.parent.GetClientSize()
+        trace_area = (self.margin_left, 0, self._trace_area_width(size),
+                      size.height)
+
+        # Only the visible cycles and monitors are drawn
+        first_cycle, last_cycle = self._visible_cycles(size)
+        first_monitor, last_monitor = self._visible_monitors(size)
 
         # Render canvas canvas components
+        self._set_scissor(trace_area)
         self._render_grid(size)
 
         # Render signal traces starting from the top of the canvas
-        num_monitors = len(self.parent.parent.monitors.monitors_dictionary)
-        if num_monitors > 0:
+        num_monitors = len(monitors_dictionary)
+        if first_monitor < last_monitor:
             y_pos = self.border_bottom + self.margin_bottom + \
-                (num_monitors - 1) * self.monitor_spacing
-            for device_id, output_id in self.parent.parent.monitors.\
-                    monitors_dictionary:
-                self._render_monitor(
+                (num_monitors - 1 - first_monitor) * self.monitor_spacing
+
+            # Trace level of each signal value: 0 for low, 1 for high and -1
+            # for BLANK signals, which are not drawn
+            levels = np.zeros(len(devices.signal_types), np.int8)
+            levels[[devices.HIGH, devices.RISING]] = 1
+            levels[devices.BLANK] = -1
+
+            self._signal_arrays.prune(monitors_dictionary)
+
+            names = []
+            fill_quads = []
+            fill_lines = []
+            trace_strips = []
+            strip_lengths = []
+            for device_id, output_id in itertools.islice(
+                    monitors_dictionary, first_monitor, last_monitor):
+                geometry = self._render_monitor(
                     device_id,
                     output_id,
                     y_pos,
                     y_pos +
-                    self.trace_height, size)
+                    self.trace_height, first_cycle, last_cycle, levels)
+                names.append(geometry[0])
+                fill_quads.append(geometry[1])
+                fill_lines.append(geometry[2])
+                trace_strips.append(geometry[3])
+                strip_lengths.append(geometry[4])
                 y_pos -= self.monitor_spacing
 
+            # Draw rectangles underneath HIGH signals for more clarity
+            self._set_color(_HIGH_FILL_COLOR)
+            self._set_line_width(1)
+            self._draw_arrays(GL.GL_QUADS, fill_quads)
+            self._draw_arrays(GL.GL_LINES, fill_lines)
+
+            # Draw signal traces
+            self._set_color(_TRACE_COLOR)
+            self._set_line_width(1.5)
+            self._draw_strips(trace_strips, strip_lengths)
+
+            # Draw monitor names, 4 pixels from the left edge of the canvas
+            self._set_scissor((0, 0, self.margin_left, size.height))
+            text_x_pos = ((4 - self.margin_left) * size.width /
+                          self._trace_area_width(size) - self.pan_x) / \
+                self.zoom
+            for monitor_name, text_y_pos in names:
+                self.render_text(monitor_name, text_x_pos, text_y_pos)
+
         # Render ruler components
         # Render ruler background across the whole width of the canvas
-        GL.glViewport(0, 0, size.width, size.height)
+        self._set_scissor(None)
         self._render_ruler_background(size)
-        GL.glViewport(self.margin_left, 0, size.width - self.margin_left,
-                      size.height)
-        self._render_cycle_numbers(size)
+        self._set_scissor(trace_area)
+        self._render_cycle_numbers(size, first_cycle, last_cycle)
         self._render_grid(size, render_only_on_ruler=True)
+        self._set_scissor(None)
+        if self._can_store_frame:
+            # Without a stored frame, on_paint always renders in full
+            self._store_frame(size)
 
         # We have been drawing to the back buffer, flush the graphics pipeline
         # and swap the back buffer to the front
         GL.glFlush()
         self.parent.SwapBuffers()
 
+    def _store_frame(self, size):
+        """Copy the frame in the back buffer to the frame texture."""
+        if size.width <= 0 or size.height <= 0:
+            return
+        if self._frame_fbo is None:
+            self._frame_fbo = GL.glGenFramebuffers(1)
+            self._frame_texture = GL.glGenTextures(1)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self._frame_texture)
+        if self._frame_size != (size.width, size.height):
+            GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGBA, size.width,
+                            size.height, 0, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE,
+                            None)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER,
+                               GL.GL_NEAREST)
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._frame_fbo)
+            GL.glFramebufferTexture2D(GL.GL_FRAMEBUFFER,
+                                      GL.GL_COLOR_ATTACHMENT0,
+                                      GL.GL_TEXTURE_2D, self._frame_texture, 0)
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+            self._frame_size = (size.width, size.height)
+        GL.glReadBuffer(GL.GL_BACK)
+        GL.glCopyTexSubImage2D(GL.GL_TEXTURE_2D, 0, 0, 0, 0, 0, size.width,
+                               size.height)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        self._dirty = False
+
+    def _draw_stored_frame(self, size):
+        """Repaint the canvas with the frame stored by the last render()."""
+        self._set_scissor(None)
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self._frame_fbo)
+        GL.glBlitFramebuffer(0, 0, size.width, size.height,
+                             0, 0, size.width, size.height,
+                             GL.GL_COLOR_BUFFER_BIT, GL.GL_NEAREST)
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, 0)
+        GL.glFlush()
+        self.parent.SwapBuffers()
+
+    def _update_matrices(self):
+        """Update the viewport and matrices that have changed since the
+        context was configured."""
+        if self._viewport_dirty or self._modelview_dirty:
+            size = self.parent.GetClientSize()
+            if self._viewport_dirty:
+                self._update_viewport(size)
+            self._update_modelview(size)
+
     def on_paint(self, event):
         """Handle the paint event."""
         self.parent.SetCurrent(self.parent.context)
@@ -281,275 +676,279 @@ class MyGLCanvas_2D():
             self.init = True
 
         size = self.parent.GetClientSize()
-        text = "".join(["Canvas redrawn on paint event, size is ",
-                        str(size.width), ", ", str(size.height)])
-        self.render(text)
+        if not self._dirty and self._frame_size == (size.width, size.height):
+            # Nothing has changed since the last frame was drawn
+            self._draw_stored_frame(size)
+            return
+        self.render("")
 
     def on_size(self, event):
         """Handle the canvas resize event."""
-        # Forces reconfiguration of the viewport, modelview and projection
-        # matrices on the next paint event
-        self.init = False
-        self._update_zoom_lower_bound()
-        self.zoom = self.zoom_lower
-        self._update_borders()
-        self._bound_panning()
+        # Forces update of the viewport, modelview and projection matrices
+        # on the next paint event
+        self._viewport_dirty = True
+        self._dirty = True
+        self._recompute_transform(reset_zoom=True)
 
     def on_mouse(self, event):
-        """Handle mouse events."""
-        text = ""
+        """Handle mouse events.
+
+        The canvas is not redrawn here. When the pan or zoom changes, a
+        repaint is requested instead, so that the many mouse events of a drag
+        are drawn as one frame.
+        """
         if event.ButtonDown():
             self.last_mouse_x = event.GetX()
             self.last_mouse_y = event.GetY()
-            text = "".join(["Mouse button pressed at: ", str(event.GetX()),
-                            ", ", str(event.GetY())])
-        if event.ButtonUp():
-            text = "".join(["Mouse button released at: ", str(event.GetX()),
-                            ", ", str(event.GetY())])
-        if event.Leaving():
-            text = "".join(["Mouse left canvas at: ", str(event.GetX()),
-                            ", ", str(event.GetY())])
         if event.Dragging():
             self.pan_x += event.GetX() - self.last_mouse_x
             self.pan_y -= event.GetY() - self.last_mouse_y
             self.last_mouse_x = event.GetX()
             self.last_mouse_y = event.GetY()
-            self.init = False
-            text = "".join(["Mouse dragged to: ", str(event.GetX()),
-                            ", ", str(event.GetY()), ". Pan is now: ",
-                            str(self.pan_x), ", ", str(self.pan_y)])
+            self._modelview_dirty = True
         if event.GetWheelRotation() < 0:
             self.zoom *= (1.0 + (
                 event.GetWheelRotation() / (20 * event.GetWheelDelta())))
-            self.init = False
-            text = "".join(["Negative mouse wheel rotation. Zoom is now: ",
-                            str(self.zoom)])
+            self._modelview_dirty = True
         if event.GetWheelRotation() > 0:
             self.zoom /= (1.0 - (
                 event.GetWheelRotation() / (20 * event.GetWheelDelta())))
-            self.init = False
-            text = "".join(["Positive mouse wheel rotation. Zoom is now: ",
-                            str(self.zoom)])
-        if text:
-            self.render(text)
-        else:
-            self.parent.Refresh()  # triggers the paint event
-
-    def _bound_panning(self):
-        """Bound pan_x, pan_y variables with respect to the signal traces."""
-        size = self.parent.GetClientSize()
-        # Calculate allowable pan values
-        allowable_pan_right = -self.border_right * self.zoom + size.width
-        allowable_pan_left = self.border_left
-        allowable_pan_bottom = self.border_bottom
-        allowable_pan_top = -(self.border_top * self.zoom) + size.height
-
-        # if true, some part of the signal traces is hidden (x dir)
-        if allowable_pan_right < 0:
-            if self.pan_x < allowable_pan_right:
-                self.pan_x = allowable_pan_right
-        else:
-            if self.pan_x < 0:
-                self.pan_x = 0
-
-        if self.pan_x > allowable_pan_left:
-            self.pan_x = allowable_pan_left
-
-        # if true, some monitors are hidden (y dir)
-        if allowable_pan_top < 0:
-            if self.pan_y < allowable_pan_top:
-                self.pan_y = allowable_pan_top
-        else:
-            if self.pan_y < 0:
-                self.pan_y = 0
-
-        if self.pan_y > allowable_pan_bottom:
-            self.pan_y = allowable_pan_bottom
-
-    def _bound_zooming(self):
-        """Bound zoom."""
-        if self.zoom > self.zoom_upper:
-            self.zoom = self.zoom_upper
-        elif self.zoom < self.zoom_lower:
-            self.zoom = self.zoom_lower
-
-    def _update_zoom_lower_bound(self):
-        """Adjust zoom lower bound when the canvas is resized or the number of
-        monitors changes."""
+            self._modelview_dirty = True
+        if self._modelview_dirty:
+            # Pan or zoom has changed
+            self._dirty = True
+            self._recompute_transform()
+            self.parent.request_refresh()  # triggers the paint event
+
+    def _recompute_transform(self, reset_zoom=False):
+        """Update the zoom and pan bounds and clamp zoom and pan to them.
+
+        Called whenever the zoom, the pan, the canvas size or the displayed
+        signals change, so that render() does not have to. If reset_zoom is
+        True, the zoom is set to its lower bound.
+        """
         size = self.parent.GetClientSize()
-
-        # Allow a max number of 7 monitors to be displayed at once
-        num_monitors = min(7, len(self.parent.parent.monitors.
-                                  monitors_dictionary))
-
-        # Adjust zoom bounds depending on number of monitors
-        visible_objects_height = self.margin_bottom + \
-            num_monitors * self.monitor_spacing + self.ruler_height
-        self.zoom_lower = min(
-            size.height /
-            (visible_objects_height),
-            self.zoom_upper)
-
-    def _update_borders(self):
-        """Update the borders of the canvas depending on the number of monitors
-        and the number of cycles to be simulated."""
-        num_monitors = len(self.parent.parent.monitors.monitors_dictionary)
-        # border_top depends only on the number of monitors
-        self.border_top = self.border_bottom + self.margin_bottom + \
-            num_monitors * self.monitor_spacing + self.ruler_height / self.zoom
-        # border_right depends only on the number of cycles to be simulated
-        self.border_right = self.parent.parent.cycles_completed * \
-            self.cycle_width
+        # A zoom of 0 is clamped up to the lower bound
+        zoom = 0 if reset_zoom else self.zoom
+        (self.zoom_lower, self.zoom, self.pan_x, self.pan_y, self.border_top,
+         self.border_right) = _compute_transform(
+            size.width, size.height,
+            len(self.parent.parent.monitors.monitors_dictionary),
+            self.parent.parent.cycles_completed, self.cycle_width,
+            self.monitor_spacing, self.ruler_height, self.margin_bottom,
+            zoom, self.zoom_upper, self.pan_x, self.pan_y,
+            self.border_left, self.border_bottom)
 
     def render_text(self, text, x_pos, y_pos):
         """Handle text drawing operations."""
-        GL.glColor3f(0.0, 0.0, 0.0)  # text is black
-        GL.glRasterPos2f(x_pos, y_pos)
-
-        for character in text:
-            if character == '\n':
-                y_pos = y_pos - 20
-                GL.glRasterPos2f(x_pos, y_pos)
-            else:
-                GLUT.glutBitmapCharacter(self.font, ord(character))
-
-    def _render_monitor(self, device_id, output_id, y_min, y_max, size):
+        self._set_color(_TEXT_COLOR)
+        if self._font_base is None:
+            self._font_base = _compile_font(self.font)
+        GL.glListBase(self._font_base)
+
+        for line in text.split('\n'):
+            GL.glRasterPos2f(x_pos, y_pos)
+            if line:
+                GL.glCallLists(line.encode('ascii', 'replace'))
+            y_pos = y_pos - 20
+
+    def _render_monitor(self, device_id, output_id, y_min, y_max,
+                        first_cycle, last_cycle, levels):
         """Handle monitor name and signal trace drawing for a single
-        monitor."""
-        monitor_name = self.parent.parent.devices.get_signal_name(
-            device_id, output_id)
-        signal_list = self.parent.parent.monitors.monitors_dictionary[(
-            device_id, output_id)]
-
-        # Draw monitor name
-        # Render on different viewport
-        GL.glViewport(0, 0, self.margin_left, size.height)
-        text_x_pos = -self.pan_x / self.zoom + 4
+        monitor.
+
+        Only the signals from first_cycle up to, but not including,
+        last_cycle are drawn. levels is an array of the trace level of each
+        signal value. Returns the monitor name with the y position of its
+        text, followed by the vertices of the HIGH signal fill rectangles, the
+        lines along their bottom and the signal trace line strips as three
+        arrays, and the number of vertices of each strip. They are drawn in
+        batches together with those of the other monitors.
+        """
+        gui = self.parent.parent
+        monitor_name = gui.devices.get_signal_name(device_id, output_id)
         text_y_pos = (y_min + y_max) / 2 - \
             self.character_height / (2 * self.zoom)
-        self.render_text(monitor_name, text_x_pos, text_y_pos)
-        GL.glViewport(self.margin_left, 0, size.width - self.margin_left,
-                      size.height)
 
-        # Draw rectangles underneath HIGH signals for more clarlity
-        x_pos = 0
-        fill_color = [103 / 255, 218 / 255, 255 / 255]
-        GL.glColor3fv(fill_color)
-        for signal in signal_list:
-            if (signal == self.parent.parent.devices.HIGH) \
-                    or (signal == self.parent.parent.devices.RISING):
-                self._render_rectangle((x_pos, y_min),
-                                       (x_pos + self.cycle_width, y_max))
-                GL.glBegin(GL.GL_LINE_STRIP)
-                GL.glVertex2f(x_pos, y_min)
-                GL.glVertex2f(x_pos + self.cycle_width, y_min)
-                GL.glEnd()
-            x_pos += self.cycle_width
-
-        # Draw signal trace
-        x_pos = 0
-        currently_drawing = False
-        trace_color = [0 / 255, 122 / 255, 193 / 255]
-        GL.glColor3fv(trace_color)  # signal trace is blue
-        GL.glLineWidth(1.5)
-        for signal in signal_list:
-            if signal == self.parent.parent.devices.BLANK:
-                if currently_drawing:
-                    GL.glEnd()
-                    currently_drawing = False
-                x_pos += self.cycle_width
-            else:
-                if not currently_drawing:
-                    GL.glBegin(GL.GL_LINE_STRIP)
-                    currently_drawing = True
-                if signal == self.parent.parent.devices.HIGH:
-                    y = y_max
-                if signal == self.parent.parent.devices.LOW:
-                    y = y_min
-                if signal == self.parent.parent.devices.RISING:
-                    y = y_max
-                if signal == self.parent.parent.devices.FALLING:
-                    y = y_min
-                GL.glVertex2f(x_pos, y)
-                x_pos += self.cycle_width
-                GL.glVertex2f(x_pos, y)
-
-        if currently_drawing:
-            GL.glEnd()
-            currently_drawing = False
-
-    def _render_line(self, start_point, end_point):
-        """Render a straight line on the canvas, with the given end points."""
-        # check validity of arguments
-        if not (
-            isinstance(
-                start_point,
-                tuple) and isinstance(
-                end_point,
-                tuple)):
-            raise TypeError(
-                "start_point and end_point arguments must be of Type tuple")
-        if (len(start_point) != 2 or len(end_point) != 2):
-            raise ValueError("start_point and end_point arguments must be \
-                            tuples of length 2")
-        # draw line
-        GL.glLineWidth(1)
-        GL.glBegin(GL.GL_LINE_STRIP)
-        GL.glVertex2f(start_point[0], start_point[1])
-        GL.glVertex2f(end_point[0], end_point[1])
-        GL.glEnd()
-
-    def _render_rectangle(self, bottom_left_point, top_right_point):
-        """Render a rectangle on the canvas, with the given end points."""
-        # check validity of arguments
-        if not (
-            isinstance(
-                bottom_left_point,
-                tuple) and isinstance(
-                top_right_point,
-                tuple)):
-            raise TypeError("bottom_left_point and top_right_point arguments \
-                            must be of Type tuple")
-        if (len(bottom_left_point) != 2 or len(top_right_point) != 2):
-            raise ValueError("bottom_left_point and top_right_point arguments \
-                             must be tuples of length 2")
-        # draw rectangle
-        GL.glLineWidth(1)
-        GL.glBegin(GL.GL_QUADS)
-        GL.glVertex2f(bottom_left_point[0], bottom_left_point[1])
-        GL.glVertex2f(top_right_point[0], bottom_left_point[1])
-        GL.glVertex2f(top_right_point[0], top_right_point[1])
-        GL.glVertex2f(bottom_left_point[0], top_right_point[1])
-        GL.glEnd()
-
-    def _render_cycle_numbers(self, size):
-        """Handle cycle numbers drawing at the top of the canvas (ruler)."""
-        if self.parent.parent.cycles_completed == 0:
+        # Rectangles underneath HIGH signals, with a line along their bottom.
+        # Consecutive HIGH cycles share a single rectangle.
+        signals = self._signal_arrays.get(
+            (device_id, output_id),
+            gui.monitors.monitors_dictionary[(device_id, output_id)])[
+                first_cycle:last_cycle]
+        signal_levels = levels[signals]
+        x_starts = np.arange(first_cycle, first_cycle + len(signals),
+                             dtype=np.float32) * self.cycle_width
+        x_ends = x_starts + self.cycle_width
+        high_starts, high_ends = _runs(signal_levels > 0)
+        fill_x_starts = x_starts[high_starts]
+        fill_x_ends = x_ends[high_ends - 1]
+        fill_quads = np.empty((len(fill_x_starts), 4, 2), np.float32)
+        fill_quads[:, :, 0] = np.column_stack(
+            [fill_x_starts, fill_x_ends, fill_x_ends, fill_x_starts])
+        fill_quads[:, :, 1] = (y_min, y_min, y_max, y_max)
+        fill_lines = np.empty((len(fill_x_starts), 2, 2), np.float32)
+        fill_lines[:, :, 0] = np.column_stack([fill_x_starts, fill_x_ends])
+        fill_lines[:, :, 1] = y_min
+
+        # Signal trace: a line strip for every run of cycles that are not
+        # BLANK, through the start and end of each cycle of the run
+        drawn = signal_levels >= 0
+        ys = y_min + signal_levels * np.float32(y_max - y_min)
+        trace_strips = np.empty((np.count_nonzero(drawn), 2, 2), np.float32)
+        trace_strips[:, :, 0] = np.column_stack(
+            [x_starts[drawn], x_ends[drawn]])
+        trace_strips[:, :, 1] = ys[drawn, np.newaxis]
+        drawn_starts, drawn_ends = _runs(drawn)
+        strip_lengths = 2 * (drawn_ends - drawn_starts)
+
+        return ((monitor_name, text_y_pos), fill_quads, fill_lines,
+                trace_strips, strip_lengths)
+
+    def _visible_cycles(self, size):
+        """Return the range (first, last) of the cycles that are visible, at
+        least in part, on the canvas. last is not included."""
+        cycle_width = self.zoom * self.cycle_width
+        first_cycle = max(0, int(-self.pan_x / cycle_width))
+        last_cycle = min(self.parent.parent.cycles_completed,
+                         int((size.width - self.pan_x) / cycle_width) + 1)
+        return first_cycle, max(first_cycle, last_cycle)
+
+    def _visible_monitors(self, size):
+        """Return the range (first, last) of the monitors that are visible, at
+        least in part, on the canvas, counted from the top. last is not
+        included."""
+        num_monitors = len(self.parent.parent.monitors.monitors_dictionary)
+        # Monitor i from the top has its trace starting at y_bottom + offset
+        # * monitor_spacing, where offset = num_monitors - 1 - i
+        y_bottom = self.border_bottom + self.margin_bottom
+        lowest_offset = math.ceil(
+            (-self.pan_y / self.zoom - y_bottom - self.trace_height) /
+            self.monitor_spacing)
+        highest_offset = math.floor(
+            ((size.height - self.pan_y) / self.zoom - y_bottom) /
+            self.monitor_spacing)
+        first_monitor = max(0, num_monitors - 1 - highest_offset)
+        last_monitor = min(num_monitors, num_monitors - lowest_offset)
+        return first_monitor, max(first_monitor, last_monitor)
+
+    def _draw_arrays(self, mode, vertex_arrays):
+        """Draw the vertices in the list of vertex arrays with a single
+        glDrawArrays call, uploading them to the trace vertex buffer."""
+        num_vertices = self._upload_vertices(vertex_arrays)
+        if num_vertices == 0:
             return
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glDrawArrays(mode, 0, num_vertices)
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
 
-        for cycle in range(self.parent.parent.cycles_completed):
-            # count number of digits in number
-            num_digits = len(str(cycle + 1))
-            # draw cycle number
-            text_x_pos = - 0.5 * num_digits * self.character_width / \
-                self.zoom + (cycle + 0.5) * self.cycle_width
-            text_y_pos = (size.height - self.pan_y -
-                          self.character_height) / self.zoom
-            self.render_text(str(cycle + 1), text_x_pos, text_y_pos)
+    def _draw_strips(self, vertex_arrays, strip_lengths):
+        """Draw the line strips in the list of vertex arrays with a single
+        glMultiDrawArrays call, uploading them to the trace vertex buffer.
+
+        strip_lengths is a list of arrays with the number of vertices of
+        each strip in the vertex array of the same index.
+        """
+        counts = np.concatenate(strip_lengths).astype(np.int32)
+        if len(counts) == 0:
+            return
+        firsts = np.zeros(len(counts), np.int32)
+        np.cumsum(counts[:-1], out=firsts[1:])
+        self._upload_vertices(vertex_arrays)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glMultiDrawArrays(GL.GL_LINE_STRIP, firsts, counts, len(counts))
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+
+    def _upload_vertices(self, vertex_arrays):
+        """Upload the vertices in the list of vertex arrays to the trace
+        vertex buffer, and point the vertex array to it. Returns the number
+        of vertices."""
+        vertices = np.concatenate(vertex_arrays).reshape(-1, 2)
+        if len(vertices) == 0:
+            return 0
+        if self._trace_vbo is None:
+            self._trace_vbo = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._trace_vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices,
+                        GL.GL_STREAM_DRAW)
+        GL.glVertexPointer(2, GL.GL_FLOAT, 0, None)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        return len(vertices)
+
+    def _set_viewport(self, x, y, width, height):
+        """Set the OpenGL viewport, unless it is already set."""
+        viewport = (x, y, width, height)
+        if self._gl_state['viewport'] != viewport:
+            GL.glViewport(x, y, width, height)
+            self._gl_state['viewport'] = viewport
+
+    def _set_scissor(self, box):
+        """Restrict drawing to the (x, y, width, height) box of the canvas,
+        or draw on the whole canvas if box is None."""
+        if self._gl_state['scissor'] == box:
+            return
+        if box is None:
+            GL.glDisable(GL.GL_SCISSOR_TEST)
+        else:
+            if self._gl_state['scissor'] is None:
+                GL.glEnable(GL.GL_SCISSOR_TEST)
+            GL.glScissor(*box)
+        self._gl_state['scissor'] = box
+
+    def _trace_area_width(self, size):
+        """Return the width of the canvas area right of the left margin."""
+        return max(size.width - self.margin_left, 1)
+
+    def _set_color(self, color):
+        """Set the current OpenGL color, given as an (r, g, b) tuple, unless
+        it is already set."""
+        if self._gl_state['color'] != color:
+            GL.glColor3f(*color)
+            self._gl_state['color'] = color
+
+    def _set_line_width(self, width):
+        """Set the OpenGL line width, unless it is already set."""
+        if self._gl_state['line_width'] != width:
+            GL.glLineWidth(width)
+            self._gl_state['line_width'] = width
+
+    def _render_cycle_numbers(self, size, first_cycle, last_cycle):
+        """Handle cycle numbers drawing at the top of the canvas (ruler), for
+        the cycles from first_cycle up to, but not including, last_cycle."""
+        if last_cycle > len(self._cycle_labels):
+            new_labels = [str(cycle + 1).encode('ascii') for cycle in
+                          range(len(self._cycle_labels), last_cycle)]
+            self._cycle_labels.extend(new_labels)
+            self._cycle_label_lengths = np.concatenate([
+                self._cycle_label_lengths,
+                np.array([len(label) for label in new_labels], np.float32)])
+
+        # draw cycle numbers, centred on the cycles
+        text_x_positions = - 0.5 * self.character_width / self.zoom * \
+            self._cycle_label_lengths[first_cycle:last_cycle] + \
+            (np.arange(first_cycle, last_cycle) + 0.5) * self.cycle_width
+        text_y_pos = (size.height - self.pan_y -
+                      self.character_height) / self.zoom
+
+        self._set_color(_TEXT_COLOR)
+        if self._font_base is None:
+            self._font_base = _compile_font(self.font)
+        GL.glListBase(self._font_base)
+        labels = self._cycle_labels[first_cycle:last_cycle]
+        raster_pos = GL.glRasterPos2f
+        call_lists = GL.glCallLists
+        for label, text_x_pos in zip(labels, text_x_positions.tolist()):
+            raster_pos(text_x_pos, text_y_pos)
+            call_lists(label)
 
     def _render_ruler_background(self, size):
         """Draw a background for the ruler."""
-        ruler_color = [200 / 255, 230 / 255, 255 / 255]
         # Make sure transformations don't affect other renderings
         GL.glPushMatrix()
         GL.glLoadIdentity()
-        GL.glColor3fv(ruler_color)
-        GL.glBegin(GL.GL_QUADS)
-        GL.glVertex2f(0.0, size.height)
-        GL.glVertex2f(0.0, size.height - self.ruler_height)
-        GL.glVertex2f(size.width, size.height - self.ruler_height)
-        GL.glVertex2f(size.width, size.height)
-        GL.glEnd()
+        self._set_color(_RULER_COLOR)
+        GL.glRectf(0.0, size.height - self.ruler_height, size.width,
+                   size.height)
         GL.glPopMatrix()
 
     def _render_grid(self, size, render_only_on_ruler=False):
@@ -566,29 +965,45 @@ class MyGLCanvas_2D():
         else:
             line_y_pos_start = self.border_bottom - self.pan_y / self.zoom
 
-        # render vertical lines
-        GL.glColor3f(0.9, 0.9, 0.9)  # light grey color
-        line_x_pos = 0
-        self._render_line((line_x_pos, line_y_pos_start),
-                          (line_x_pos, line_y_pos_end))
-        for cycle in range(self.parent.parent.cycles_completed):
-            line_x_pos += self.cycle_width
-            self._render_line((line_x_pos, line_y_pos_start),
-                              (line_x_pos, line_y_pos_end))
+        # The grid lines run from y = 0 to y = 1 in the vertex buffer, and
+        # are only rebuilt when the number of cycles changes
+        cycles = self.parent.parent.cycles_completed
+        if self._grid_vbo is None:
+            self._grid_vbo = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._grid_vbo)
+        if cycles != self._grid_cycles:
+            vertices = np.zeros((cycles + 1, 2, 2), np.float32)
+            vertices[:, :, 0] = np.arange(cycles + 1)[:, np.newaxis] * \
+                self.cycle_width
+            vertices[:, 1, 1] = 1
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices,
+                            GL.GL_STATIC_DRAW)
+            self._grid_cycles = cycles
+        GL.glVertexPointer(2, GL.GL_FLOAT, 0, None)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+        # render vertical lines, stretched to the required length
+        self._set_color(_GRID_COLOR)
+        self._set_line_width(1)
+        GL.glPushMatrix()
+        GL.glTranslatef(0, line_y_pos_start, 0)
+        GL.glScalef(1, line_y_pos_end - line_y_pos_start, 1)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glDrawArrays(GL.GL_LINES, 0, 2 * (cycles + 1))
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glPopMatrix()
 
     def recenter(self, pan_to_end=False):
         """Restore canvas to its default pan position and zoom state. If
         pan_to_end argument is true, the canvas is panned to the end of the
         signal traces."""
-        self.zoom = self.zoom_lower
         self.pan_y = self.border_bottom
+        self.pan_x = self.border_left
+        self._recompute_transform(reset_zoom=True)
         if pan_to_end:  # if true pan to the end of the signal trace
-            self._update_borders()
             size = self.parent.GetClientSize()
-            allowable_pan_right = -self.border_right * self.zoom + size.width
-            self.pan_x = allowable_pan_right
-        else:
-            self.pan_x = self.border_left
+            self.pan_x = -self.border_right * self.zoom + size.width
+            self._recompute_transform()
 
         self.init = False
         self.render("Recenter canvas")
@@ -601,8 +1016,7 @@ class MyGLCanvas_2D():
         restore_state() should be called whenever the gui method
         on_open() and set_monitor() is called."""
         self.init = False
-        self._update_zoom_lower_bound()
-        self.zoom = self.zoom_lower
+        self._recompute_transform(reset_zoom=True)
         self.render("")
 
 
@@ -646,21 +1060,10 @@ class MyGLCanvas_3D():
         self.color_scheme = ColorScheme.get_default()
 
         self.init = False
-
-        # Constants for OpenGL materials and lights
-        self.mat_diffuse = [0.0, 0.0, 0.0, 1.0]
-        self.mat_no_specular = [0.0, 0.0, 0.0, 0.0]
-        self.mat_no_shininess = [0.0]
-        self.mat_specular = [0.5, 0.5, 0.5, 1.0]
-        self.mat_shininess = [50.0]
-        self.top_right = [1.0, 1.0, 1.0, 0.0]
-        self.straight_on = [0.0, 0.0, 1.0, 0.0]
-        self.no_ambient = [0.0, 0.0, 0.0, 1.0]
-        self.dim_diffuse = [0.5, 0.5, 0.5, 1.0]
-        self.bright_diffuse = [1.0, 1.0, 1.0, 1.0]
-        self.med_diffuse = [0.75, 0.75, 0.75, 1.0]
-        self.full_specular = [0.5, 0.5, 0.5, 1.0]
-        self.no_specular = [0.0, 0.0, 0.0, 1.0]
+        self._context_current = False
+        self._state_initialized = False  # fixed state is set up only once
+        self._viewport_dirty = True  # viewport and projection need updating
+        self._modelview_dirty = False  # pan, zoom or rotation have changed
 
         # 3D rendering settings
         self.cycle_depth = 20  # equivalent to cycle_width for 2D class
@@ -675,8 +1078,77 @@ class MyGLCanvas_3D():
         self.last_mouse_x = 0  # previous mouse x position
         self.last_mouse_y = 0  # previous mouse y position
 
-        # Initialise the scene rotation matrix
-        self.scene_rotate = np.identity(4, 'f')
+        # Initialise the scene rotation matrix, and a C float array holding
+        # the full modelview matrix that is passed to OpenGL as it is
+        self._modelview_buf = (GL.GLfloat * 16)()
+        self._set_scene_rotate(np.identity(4, 'f'))
+        # The modelview matrix last loaded, in row-major order
+        self._view_matrix = np.identity(4, np.float32)
+
+        # Unit cuboid centred on the y axis with its base at y = 0, drawn as
+        # 12 triangles sharing its 8 corners. It is scaled and translated to
+        # draw each signal cycle.
+        self._unit_cube_verts = np.array([
+            [-1, 0, -1], [1, 0, -1], [1, 0, 1], [-1, 0, 1],
+            [1, 1, -1], [-1, 1, -1], [-1, 1, 1], [1, 1, 1]], np.float32)
+        # The cuboids are flat shaded, so each triangle has the color of its
+        # last vertex, which is lit with the normal of that vertex. Each face
+        # ends its triangles on a different corner, which has the normal of
+        # that face. Corners 1 and 6 do not end any triangle.
+        self._unit_cube_norms = np.array([
+            [0, -1, 0], [0, -1, 0], [1, 0, 0], [0, 0, 1],
+            [0, 0, -1], [-1, 0, 0], [0, 1, 0], [0, 1, 0]], np.float32)
+        self._unit_cube_indices = np.array([
+            1, 2, 0, 2, 3, 0,  # bottom
+            4, 5, 7, 5, 6, 7,  # top
+            0, 3, 5, 3, 6, 5,  # left
+            1, 4, 2, 4, 7, 2,  # right
+            1, 0, 4, 0, 5, 4,  # back
+            2, 7, 3, 7, 6, 3], np.uint32)  # front
+
+        # Buffer objects for the cuboid vertex positions, vertex colors and
+        # indices, and the vertex array object holding their bindings. The
+        # vertex array object is 0 if the context does not support them.
+        self._cuboid_vbos = None
+        self._cuboid_vao = None
+        self._index_capacity = 0  # number of cuboids in the index buffer
+        # The cuboids of each monitor in the vertex buffer, to skip
+        # uploading the same cuboids again
+        self._uploaded_cuboids = None
+        # The color of each uploaded cuboid, and the scene rotation that
+        # their lit vertex colors were computed for
+        self._cuboid_colors = np.empty((0, 3), np.float32)
+        self._shaded_rotation = None
+
+        # Vertex positions and colors of the cuboids, reused between frames
+        # and only reallocated when more cuboids need to be drawn
+        self._vert_buf = np.empty((0, 8, 3), np.float32)
+        self._color_buf = np.empty((0, 8, 3), np.float32)
+
+        # Base of the display lists of the text font characters
+        self._font_base = None
+
+        # Cycle number labels, as ASCII strings. Label i is the number of
+        # cycle i, counting from 1.
+        self._cycle_labels = []
+        # The z position of the centre of each cycle, with the number of
+        # cycles it was computed for
+        self._cycle_z_positions = (0, [])
+
+        # The signals of each monitor as an array, and the cuboid height of
+        # each signal value with the devices it was built for
+        self._signal_arrays = _SignalArrays()
+        self._heights = (None, None)
+
+        # The signal trace cuboids of each monitor, with the signals, heights
+        # and position they were built from:
+        # {(device_id, output_id): (signals, heights, x_pos, z_start, color,
+        #                           cuboid)}
+        self._monitor_cuboids = {}
+
+        # Cache of the OpenGL state, to skip redundant state changes. None
+        # means that the state is unknown.
+        self._gl_state = {'enabled': {}, 'color': None}
 
         # Initialise variables for zooming
         self.zoom = 1
@@ -686,231 +1158,488 @@ class MyGLCanvas_3D():
 
     def init_gl(self):
         """Configure and initialise the OpenGL context."""
-        size = self.parent.GetClientSize()
-        self.parent.SetCurrent(self.parent.context)
+        self._ensure_current()
+
+        # The state may have been changed elsewhere, e.g. by the 2D mode
+        self._gl_state = {'enabled': {}, 'color': None}
+
+        if self._viewport_dirty:
+            self._update_viewport()
+            self._viewport_dirty = False
+
+        if not self._state_initialized:
+            self._setup_state_once()
+            self._state_initialized = True
+
+        GL.glClearColor(0.0, 0.0, 0.0, 0.0)
+        GL.glDrawBuffer(GL.GL_BACK)
+        # Each face takes the baked color of its provoking corner. This is
+        # set on every init, as the 2D mode switches back to smooth shading
+        GL.glShadeModel(GL.GL_FLAT)
+        self._set_enabled(GL.GL_CULL_FACE, True)
+        self._set_enabled(GL.GL_DEPTH_TEST, True)
+
+        self._update_modelview()
+
+    def _update_modelview(self):
+        """Load the modelview matrix built from the pan, zoom and rotation."""
+        self._view_matrix = self._modelview_matrix()
+        # OpenGL expects column-major order, the transpose of numpy's
+        matrix = np.ascontiguousarray(self._view_matrix.T, np.float32)
+        ctypes.memmove(self._modelview_buf, matrix.ctypes.data,
+                       ctypes.sizeof(self._modelview_buf))
+        GL.glMatrixMode(GL.GL_MODELVIEW)
+        GL.glLoadMatrixf(self._modelview_buf)
+        self._modelview_dirty = False
+
+    def _modelview_matrix(self):
+        """Return the modelview matrix in row-major order.
 
+        This is the viewing transformation, which sets the viewpoint back
+        from the scene, followed by the modelling transformation, which
+        pans, rotates and zooms the scene.
+        """
+        modelview = np.identity(4, np.float32)
+        modelview[:3, 3] = (self.pan_x, self.pan_y, -self.depth_offset)
+        # scene_rotate is stored in OpenGL (column-major) order
+        return modelview @ self.scene_rotate.T @ \
+            np.diag(np.array([self.zoom, self.zoom, self.zoom, 1], np.float32))
+
+    def _set_scene_rotate(self, matrix):
+        """Set the scene rotation matrix, given in OpenGL (column-major)
+        order."""
+        self.scene_rotate = np.ascontiguousarray(matrix, np.float32)
+
+    def _ensure_current(self):
+        """Make the OpenGL context current, unless it already is."""
+        if not self._context_current:
+            # SetCurrent fails if the canvas is not shown yet
+            self._context_current = self.parent.SetCurrent(
+                self.parent.context)
+
+    def _update_viewport(self):
+        """Update the viewport and projection matrix to the canvas size."""
+        size = self.parent.GetClientSize()
         GL.glViewport(0, 0, size.width, size.height)
 
         GL.glMatrixMode(GL.GL_PROJECTION)
         GL.glLoadIdentity()
         GLU.gluPerspective(45, size.width / size.height, 10, 10000)
-
         GL.glMatrixMode(GL.GL_MODELVIEW)
-        GL.glLoadIdentity()  # lights positioned relative to the viewer
-        GL.glLightfv(GL.GL_LIGHT0, GL.GL_AMBIENT, self.no_ambient)
-        GL.glLightfv(GL.GL_LIGHT0, GL.GL_DIFFUSE, self.med_diffuse)
-        GL.glLightfv(GL.GL_LIGHT0, GL.GL_SPECULAR, self.no_specular)
-        GL.glLightfv(GL.GL_LIGHT0, GL.GL_POSITION, self.top_right)
-        GL.glLightfv(GL.GL_LIGHT1, GL.GL_AMBIENT, self.no_ambient)
-        GL.glLightfv(GL.GL_LIGHT1, GL.GL_DIFFUSE, self.dim_diffuse)
-        GL.glLightfv(GL.GL_LIGHT1, GL.GL_SPECULAR, self.no_specular)
-        GL.glLightfv(GL.GL_LIGHT1, GL.GL_POSITION, self.straight_on)
-
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_SPECULAR, self.mat_specular)
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_SHININESS, self.mat_shininess)
-        GL.glMaterialfv(GL.GL_FRONT, GL.GL_AMBIENT_AND_DIFFUSE,
-                        self.mat_diffuse)
-        GL.glColorMaterial(GL.GL_FRONT, GL.GL_AMBIENT_AND_DIFFUSE)
 
-        GL.glClearColor(0.0, 0.0, 0.0, 0.0)
+    def _setup_state_once(self):
+        """Set up the OpenGL state that does not change between frames."""
         GL.glDepthFunc(GL.GL_LEQUAL)
-        GL.glShadeModel(GL.GL_SMOOTH)
-        GL.glDrawBuffer(GL.GL_BACK)
         GL.glCullFace(GL.GL_BACK)
-        GL.glEnable(GL.GL_COLOR_MATERIAL)
-        GL.glEnable(GL.GL_CULL_FACE)
-        GL.glEnable(GL.GL_DEPTH_TEST)
-        GL.glEnable(GL.GL_LIGHTING)
-        GL.glEnable(GL.GL_LIGHT0)
-        GL.glEnable(GL.GL_LIGHT1)
-        GL.glEnable(GL.GL_NORMALIZE)
-
-        # Viewing transformation - set the viewpoint back from the scene
-        GL.glTranslatef(0.0, 0.0, -self.depth_offset)
-
-        # Modelling transformation - pan, zoom and rotate
-        GL.glTranslatef(self.pan_x, self.pan_y, 0.0)
-        GL.glMultMatrixf(self.scene_rotate)
-        GL.glScalef(self.zoom, self.zoom, self.zoom)
 
     def render(self, text=""):
         """Handle all drawing operations."""
-        self.parent.SetCurrent(self.parent.context)
+        monitors_dictionary = self.parent.parent.monitors.monitors_dictionary
+        num_monitors = len(monitors_dictionary)
+
+        self._ensure_current()
         if not self.init:
             # Configure the OpenGL rendering context
             self.init_gl()
             self.init = True
+        else:
+            # Only the canvas size, pan, zoom or rotation may have changed
+            if self._viewport_dirty:
+                self._update_viewport()
+                self._viewport_dirty = False
+            if self._modelview_dirty:
+                self._update_modelview()
 
         # Clear everything
         GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
 
         # Draw monitors' signal traces and cycle numbers
-        num_monitors = len(self.parent.parent.monitors.monitors_dictionary)
         if num_monitors > 0:
             x_pos = -(num_monitors - 1) * self.monitor_spacing / 2
-            self._render_cycle_numbers(x_pos - self.monitor_spacing)
             self.color_scheme.reset_color()
-            for device_id, output_id in self.parent.parent.monitors.\
-                    monitors_dictionary:
-                GL.glColor3fv(self.color_scheme.get_next_color())
-                self._render_monitor(device_id, output_id, x_pos)
-                x_pos += self.monitor_spacing
 
-            self._render_cycle_numbers(x_pos)
+            heights = self._signal_heights()
+            self._signal_arrays.prune(monitors_dictionary)
+            self._monitor_cuboids = {
+                monitor: cached for monitor, cached in
+                self._monitor_cuboids.items()
+                if monitor in monitors_dictionary}
+            x_positions = x_pos + \
+                np.arange(num_monitors) * self.monitor_spacing
+            visible = self._visible_monitors(x_positions)
+            cuboids = []
+            monitor_names = []
+            get_next_color = self.color_scheme.get_next_color
+            render_monitor = self._render_monitor
+            for (device_id, output_id), x_pos, is_visible in zip(
+                    monitors_dictionary, x_positions, visible):
+                color = get_next_color()
+                if is_visible:
+                    render_monitor(device_id, output_id, x_pos, color,
+                                   heights, cuboids, monitor_names)
+            self._draw_cuboids(cuboids)
+
+            # Draw all the text after the traces, so the text color is set
+            # and lighting disabled only once
+            self._set_color3f(1.0, 1.0, 1.0)  # text is white
+            self._render_cycle_numbers(x_positions[0] - self.monitor_spacing)
+            self._render_cycle_numbers(x_positions[-1] + self.monitor_spacing)
+            for monitor_name, x_pos, z_pos in monitor_names:
+                self.render_text(monitor_name, x_pos, 0, z_pos)
 
         # We have been drawing to the back buffer, flush the graphics pipeline
         # and swap the back buffer to the front
         GL.glFlush()
         self.parent.SwapBuffers()
 
-    def _draw_cuboid(self, x_pos, z_pos, half_width, half_depth, height):
-        """Draw a cuboid.
+    def _signal_heights(self):
+        """Return the array of the cuboid height of each signal value.
 
-        Draw a cuboid at the specified position, with the specified
-        dimensions.
+        BLANK signals are not drawn and have a height of NaN. The array is
+        only built again when the devices change.
+        """
+        devices = self.parent.parent.devices
+        heights_devices, heights = self._heights
+        if heights_devices is not devices:
+            heights = np.zeros(len(devices.signal_types), np.float32)
+            heights[[devices.HIGH, devices.RISING]] = self.trace_height + 1
+            heights[[devices.LOW, devices.FALLING]] = 1
+            heights[devices.BLANK] = np.nan
+            self._heights = (devices, heights)
+        return heights
+
+    def _visible_monitors(self, x_positions):
+        """Return a mask of the monitors that may be visible on the canvas.
+
+        The box enclosing the signal trace and the name of each monitor,
+        centred at x_positions, is transformed to clip space. A monitor is
+        culled when all the corners of its box are outside the same plane of
+        the view frustum.
         """
-        GL.glBegin(GL.GL_QUADS)
-        GL.glNormal3f(0, -1, 0)
-        GL.glVertex3f(x_pos - half_width, -6, z_pos - half_depth)
-        GL.glVertex3f(x_pos + half_width, -6, z_pos - half_depth)
-        GL.glVertex3f(x_pos + half_width, -6, z_pos + half_depth)
-        GL.glVertex3f(x_pos - half_width, -6, z_pos + half_depth)
-        GL.glNormal3f(0, 1, 0)
-        GL.glVertex3f(x_pos + half_width, -6 + height, z_pos - half_depth)
-        GL.glVertex3f(x_pos - half_width, -6 + height, z_pos - half_depth)
-        GL.glVertex3f(x_pos - half_width, -6 + height, z_pos + half_depth)
-        GL.glVertex3f(x_pos + half_width, -6 + height, z_pos + half_depth)
-        GL.glNormal3f(-1, 0, 0)
-        GL.glVertex3f(x_pos - half_width, -6 + height, z_pos - half_depth)
-        GL.glVertex3f(x_pos - half_width, -6, z_pos - half_depth)
-        GL.glVertex3f(x_pos - half_width, -6, z_pos + half_depth)
-        GL.glVertex3f(x_pos - half_width, -6 + height, z_pos + half_depth)
-        GL.glNormal3f(1, 0, 0)
-        GL.glVertex3f(x_pos + half_width, -6, z_pos - half_depth)
-        GL.glVertex3f(x_pos + half_width, -6 + height, z_pos - half_depth)
-        GL.glVertex3f(x_pos + half_width, -6 + height, z_pos + half_depth)
-        GL.glVertex3f(x_pos + half_width, -6, z_pos + half_depth)
-        GL.glNormal3f(0, 0, -1)
-        GL.glVertex3f(x_pos - half_width, -6, z_pos - half_depth)
-        GL.glVertex3f(x_pos - half_width, -6 + height, z_pos - half_depth)
-        GL.glVertex3f(x_pos + half_width, -6 + height, z_pos - half_depth)
-        GL.glVertex3f(x_pos + half_width, -6, z_pos - half_depth)
-        GL.glNormal3f(0, 0, 1)
-        GL.glVertex3f(x_pos - half_width, -6 + height, z_pos + half_depth)
-        GL.glVertex3f(x_pos - half_width, -6, z_pos + half_depth)
-        GL.glVertex3f(x_pos + half_width, -6, z_pos + half_depth)
-        GL.glVertex3f(x_pos + half_width, -6 + height, z_pos + half_depth)
-        GL.glEnd()
+        size = self.parent.GetClientSize()
+        aspect = size.width / max(size.height, 1)
+        near, far = 10, 10000  # as set by gluPerspective in _update_viewport
+        focal = 1 / math.tan(math.radians(45) / 2)
+        projection = np.array([
+            [focal / aspect, 0, 0, 0],
+            [0, focal, 0, 0],
+            [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+            [0, 0, -1, 0]], np.float32)
+        transform = projection @ self._view_matrix
+
+        # Corners of the box of a monitor at x = 0
+        cycles = self.parent.parent.cycles_completed
+        z_min = -0.5 * (cycles - 1) * self.cycle_depth - self.cycle_depth / 2
+        z_max = z_min + (cycles + 1) * self.cycle_depth
+        half_width = self.trace_width / 2
+        box = np.array([[x, y, z, 1]
+                        for x in (-half_width, half_width)
+                        for y in (-6, self.trace_height - 5)
+                        for z in (z_min, z_max)], np.float32)
+        corners = np.repeat(box[np.newaxis], len(x_positions), axis=0)
+        corners[:, :, 0] += x_positions[:, np.newaxis]
+
+        clip = corners @ transform.T
+        w = clip[:, :, 3]
+        outside = np.zeros(len(x_positions), bool)
+        for axis in range(3):
+            outside |= (clip[:, :, axis] < -w).all(axis=1)
+            outside |= (clip[:, :, axis] > w).all(axis=1)
+        return ~outside
+
+    def _draw_cuboids(self, cuboids):
+        """Draw all the signal trace cuboids in a single batch.
+
+        cuboids is a list of (x_pos, z_positions, depths, heights, color)
+        tuples, one for each monitor, where z_positions, depths and heights
+        are arrays with an entry for each cuboid. The vertex positions and
+        colors of all the cuboids are kept in vertex buffer objects, uploaded
+        only when they change, and drawn with one glDrawElements call through
+        a vertex array object. The lighting is baked into the vertex colors,
+        which are computed again when the scene is rotated.
+        """
+        counts = [len(cuboid[1]) for cuboid in cuboids]
+        num_cuboids = sum(counts)
+        if num_cuboids == 0:
+            return
+        cube_size = len(self._unit_cube_verts)
+        num_vertices = cube_size * num_cuboids
+
+        if self._cuboid_vbos is None:
+            self._create_cuboid_vao()
+        index_vbo = self._cuboid_vbos[2]
+
+        # The indices only depend on the number of cuboids, so they are only
+        # uploaded when there are more cuboids than ever before
+        if num_cuboids > self._index_capacity:
+            offsets = np.arange(0, num_vertices, cube_size, dtype=np.uint32)
+            indices = self._unit_cube_indices + offsets[:, np.newaxis]
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, index_vbo)
+            GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, indices.nbytes,
+                            indices, GL.GL_STATIC_DRAW)
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+            self._index_capacity = num_cuboids
+
+        # The vertices only change with the signals, not when the scene is
+        # panned, zoomed or rotated. The cuboids of a monitor are the same
+        # object for as long as they do not change.
+        if self._uploaded_cuboids is None or \
+                len(cuboids) != len(self._uploaded_cuboids) or \
+                any(new is not old for new, old in
+                    zip(cuboids, self._uploaded_cuboids)):
+            # Attributes of each cuboid: position, depth, height and color
+            x_pos, z_positions, depths, heights, color = zip(*cuboids)
+            self._upload_cuboids(
+                np.repeat(np.array(x_pos, np.float32), counts),
+                np.concatenate(z_positions), np.concatenate(depths),
+                np.concatenate(heights),
+                np.repeat(np.array(color, np.float32), counts, axis=0))
+            self._uploaded_cuboids = list(cuboids)
+            self._shaded_rotation = None
+
+        # The scene rotation is replaced by a new array when it changes
+        if self._shaded_rotation is not self.scene_rotate:
+            self._upload_colors()
+            self._shaded_rotation = self.scene_rotate
+
+        if self._cuboid_vao:
+            GL.glBindVertexArray(self._cuboid_vao)
+        else:
+            self._bind_cuboid_arrays()
+        GL.glDrawElements(GL.GL_TRIANGLES, num_cuboids * len(
+            self._unit_cube_indices), GL.GL_UNSIGNED_INT, None)
+        if self._cuboid_vao:
+            GL.glBindVertexArray(0)
+        else:
+            GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+            GL.glDisableClientState(GL.GL_COLOR_ARRAY)
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+        # The current color is undefined after drawing with a color array
+        self._gl_state['color'] = None
+
+    def _create_cuboid_vao(self):
+        """Create the cuboid buffer objects and the vertex array object
+        that records the vertex pointers into them, so they are only set up
+        once.
+
+        Vertex array objects need OpenGL 3.0 or ARB_vertex_array_object.
+        Without them, the pointers are set on every draw instead.
+        """
+        self._cuboid_vbos = GL.glGenBuffers(3)
+        if not GL.glGenVertexArrays:
+            self._cuboid_vao = 0
+            return
+        self._cuboid_vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self._cuboid_vao)
+        self._bind_cuboid_arrays()
+        GL.glBindVertexArray(0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def _bind_cuboid_arrays(self):
+        """Point the vertex and color arrays into the cuboid buffers, and
+        bind the index buffer."""
+        vertex_vbo, color_vbo, index_vbo = self._cuboid_vbos
+        # Position and color of each vertex, 3 floats each
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vertex_vbo)
+        GL.glVertexPointer(3, GL.GL_FLOAT, 0, None)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, color_vbo)
+        GL.glColorPointer(3, GL.GL_FLOAT, 0, None)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glEnableClientState(GL.GL_COLOR_ARRAY)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, index_vbo)
+
+    def _upload_cuboids(self, x_positions, z_positions, depths, heights,
+                        cuboid_colors):
+        """Build the vertex positions of the cuboids, one for each entry of
+        the attribute arrays, and upload them to the vertex buffer. The
+        colors are kept for _upload_colors()."""
+        num_cuboids = len(heights)
+        if len(self._vert_buf) < num_cuboids:
+            self._vert_buf = np.empty(
+                (num_cuboids, len(self._unit_cube_verts), 3), np.float32)
+        vertices = self._vert_buf[:num_cuboids]
+
+        _build_cuboid_geometry(self._unit_cube_verts, x_positions,
+                               z_positions, depths, heights,
+                               self.trace_width / 2, vertices)
+        self._cuboid_colors = cuboid_colors
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._cuboid_vbos[0])
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices,
+                        GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def _upload_colors(self):
+        """Compute the lit vertex colors of the uploaded cuboids for the
+        current scene rotation, and upload them to the color buffer."""
+        num_cuboids = len(self._cuboid_colors)
+        if len(self._color_buf) < num_cuboids:
+            self._color_buf = np.empty(
+                (num_cuboids, len(self._unit_cube_verts), 3), np.float32)
+        colors = self._color_buf[:num_cuboids]
+
+        # scene_rotate is stored in OpenGL (column-major) order
+        _shade_colors(self._cuboid_colors, self._unit_cube_norms,
+                      self.scene_rotate[:3, :3].T, colors)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._cuboid_vbos[1])
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, colors.nbytes, colors,
+                        GL.GL_DYNAMIC_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def _set_enabled(self, capability, enabled):
+        """Enable or disable an OpenGL capability, unless it is already in
+        the requested state."""
+        if self._gl_state['enabled'].get(capability) is not enabled:
+            if enabled:
+                GL.glEnable(capability)
+            else:
+                GL.glDisable(capability)
+            self._gl_state['enabled'][capability] = enabled
+
+    def _set_color3f(self, red, green, blue):
+        """Set the current OpenGL color, unless it is already set."""
+        color = (red, green, blue)
+        if self._gl_state['color'] != color:
+            GL.glColor3f(red, green, blue)
+            self._gl_state['color'] = color
 
     def on_paint(self, event):
         """Handle the paint event."""
-        self.parent.SetCurrent(self.parent.context)
-        if not self.init:
-            # Configure the OpenGL rendering context
-            self.init_gl()
-            self.init = True
-
-        size = self.parent.GetClientSize()
-        text = "".join(["Canvas redrawn on paint event, size is ",
-                        str(size.width), ", ", str(size.height)])
         self.render()
 
     def on_size(self, event):
         """Handle the canvas resize event."""
-        # Forces reconfiguration of the viewport, modelview and projection
-        # matrices on the next paint event
-        self.init = False
+        # Forces update of the viewport and projection matrix on the next
+        # paint event
+        self._viewport_dirty = True
+        self._context_current = False
 
     def on_mouse(self, event):
         """Handle mouse events."""
-        self.parent.SetCurrent(self.parent.context)
-
         if event.ButtonDown():
             self.last_mouse_x = event.GetX()
             self.last_mouse_y = event.GetY()
 
-        if event.Dragging():
-            GL.glMatrixMode(GL.GL_MODELVIEW)
-            GL.glLoadIdentity()
-            x = event.GetX() - self.last_mouse_x
-            y = event.GetY() - self.last_mouse_y
-            if event.LeftIsDown():
-                GL.glRotatef(math.sqrt((x * x) + (y * y)), y, x, 0)
-            if event.MiddleIsDown():
-                GL.glRotatef((x + y), 0, 0, 1)
+        x = event.GetX() - self.last_mouse_x
+        y = event.GetY() - self.last_mouse_y
+        # Drag events without any mouse movement change nothing
+        if event.Dragging() and (x or y):
+            if event.LeftIsDown() or event.MiddleIsDown():
+                rotation = np.identity(4, np.float32)
+                if event.LeftIsDown():
+                    rotation = rotation @ _rotation_matrix(
+                        math.hypot(x, y), y, x, 0)
+                if event.MiddleIsDown():
+                    rotation = rotation @ _rotation_matrix((x + y), 0, 0, 1)
+                # scene_rotate is stored in OpenGL (column-major) order
+                self._set_scene_rotate(self.scene_rotate @ rotation.T)
             if event.RightIsDown():
                 self.pan_x += x
                 self.pan_y -= y
-            GL.glMultMatrixf(self.scene_rotate)
-            GL.glGetFloatv(GL.GL_MODELVIEW_MATRIX, self.scene_rotate)
             self.last_mouse_x = event.GetX()
             self.last_mouse_y = event.GetY()
-            self.init = False
+            self._modelview_dirty = True
 
         if event.GetWheelRotation() < 0:
             self.zoom *= (1.0 + (
                 event.GetWheelRotation() / (20 * event.GetWheelDelta())))
-            self.init = False
+            self._modelview_dirty = True
 
         if event.GetWheelRotation() > 0:
             self.zoom /= (1.0 - (
                 event.GetWheelRotation() / (20 * event.GetWheelDelta())))
-            self.init = False
+            self._modelview_dirty = True
 
-        self.parent.Refresh()  # triggers the paint event
+        # Button and leave events without any movement change nothing, and
+        # neither does panning or rotating an empty scene
+        if (self._modelview_dirty and
+                self.parent.parent.monitors.monitors_dictionary):
+            self.parent.request_refresh()  # triggers the paint event
 
     def render_text(self, text, x_pos, y_pos, z_pos):
         """Handle text drawing operations."""
-        GL.glDisable(GL.GL_LIGHTING)
-        GL.glRasterPos3f(x_pos, y_pos, z_pos)
-        font = GLUT.GLUT_BITMAP_HELVETICA_10
-
-        for character in text:
-            if character == '\n':
-                y_pos = y_pos - 20
-                GL.glRasterPos3f(x_pos, y_pos, z_pos)
-            else:
-                GLUT.glutBitmapCharacter(font, ord(character))
+        self._use_font()
 
-        GL.glEnable(GL.GL_LIGHTING)
+        for line in text.split('\n'):
+            GL.glRasterPos3f(x_pos, y_pos, z_pos)
+            if line:
+                GL.glCallLists(line.encode('ascii', 'replace'))
+            y_pos = y_pos - 20
 
-    def _render_monitor(self, device_id, output_id, x_pos):
+    def _render_monitor(self, device_id, output_id, x_pos, color, heights,
+                        cuboids, monitor_names):
         """Handle monitor name and signal trace drawing for a single
-        monitor."""
-        monitor_name = self.parent.parent.devices.get_signal_name(
-            device_id, output_id)
-        signal_list = self.parent.parent.monitors.monitors_dictionary[(
-            device_id, output_id)]
-
-        # Draw signal traces
-        cycles = self.parent.parent.cycles_completed
-        z_pos = -0.5 * (cycles - 1) * self.cycle_depth
-        for signal in signal_list:
-            if signal != self.parent.parent.devices.BLANK:
-                if signal == self.parent.parent.devices.HIGH:
-                    height = self.trace_height
-                elif signal == self.parent.parent.devices.LOW:
-                    height = 0
-                elif signal == self.parent.parent.devices.RISING:
-                    height = self.trace_height
-                elif signal == self.parent.parent.devices.FALLING:
-                    height = 0
-                self._draw_cuboid(x_pos, z_pos, self.trace_width / 2,
-                                  self.cycle_depth / 2, height + 1)
-            z_pos += self.cycle_depth
-
-        # Draw monitor name
-        GL.glColor3f(1.0, 1.0, 1.0)  # text is white
-        self.render_text(monitor_name, x_pos, 0, z_pos)
+        monitor.
+
+        heights is an array of the cuboid height of each signal value, NaN
+        for signals that are not drawn. Consecutive cycles of equal height
+        share a single cuboid. The positions, depths and heights of the
+        signal trace cuboids are appended to cuboids and drawn later,
+        together with those of the other monitors, by _draw_cuboids(). They
+        are only computed again when the signals or the position change.
+        The monitor name is appended to monitor_names with the position of
+        its text, and is drawn after the signal traces.
+        """
+        gui = self.parent.parent
+        monitor_name = gui.devices.get_signal_name(device_id, output_id)
+        signal_list = gui.monitors.monitors_dictionary[(device_id, output_id)]
+
+        # Collect signal trace cuboids
+        cycle_depth = self.cycle_depth
+        z_start = -0.5 * (gui.cycles_completed - 1) * cycle_depth
+        signals = self._signal_arrays.get((device_id, output_id), signal_list)
+        cached = self._monitor_cuboids.get((device_id, output_id))
+        if cached is None or cached[0] is not signals or \
+                cached[1] is not heights or \
+                cached[2:5] != (x_pos, z_start, color):
+            cycle_heights = heights[signals]
+            starts, ends = _equal_runs(cycle_heights)
+            run_heights = cycle_heights[starts]
+            drawn = np.isfinite(run_heights)
+            starts, ends = starts[drawn], ends[drawn]
+            z_positions = z_start + 0.5 * (starts + ends - 1) * cycle_depth
+            depths = (ends - starts) * cycle_depth
+            cuboid = (x_pos, z_positions, depths, run_heights[drawn], color)
+            self._monitor_cuboids[(device_id, output_id)] = (
+                signals, heights, x_pos, z_start, color, cuboid)
+        else:
+            cuboid = cached[5]
+        cuboids.append(cuboid)
+        z_pos = z_start + len(signal_list) * cycle_depth
+        monitor_names.append((monitor_name, x_pos, z_pos))
 
     def _render_cycle_numbers(self, x_pos):
-        """Handle rendering cycle numbers over the signal traces."""
-        GL.glColor3f(1.0, 1.0, 1.0)  # text is white
+        """Handle rendering cycle numbers over the signal traces, in the
+        current color."""
         cycles = self.parent.parent.cycles_completed
-        z_pos = -0.5 * (cycles - 1) * self.cycle_depth
-        for cycle in range(1, cycles + 1):
-            self.render_text(str(cycle), x_pos, 1, z_pos)
-            z_pos += self.cycle_depth
+        if cycles > len(self._cycle_labels):
+            self._cycle_labels.extend(
+                str(cycle + 1).encode('ascii') for cycle in
+                range(len(self._cycle_labels), cycles))
+
+        # The traces are centred on z = 0, so the cycle positions only
+        # change with the number of cycles
+        z_cycles, z_positions = self._cycle_z_positions
+        if z_cycles != cycles:
+            z_positions = ((np.arange(cycles) - 0.5 * (cycles - 1)) *
+                           self.cycle_depth).tolist()
+            self._cycle_z_positions = (cycles, z_positions)
+
+        self._use_font()
+        raster_pos = GL.glRasterPos3f
+        call_lists = GL.glCallLists
+        for label, z_pos in zip(self._cycle_labels, z_positions):
+            raster_pos(x_pos, 1, z_pos)
+            call_lists(label)
+
+    def _use_font(self):
+        """Prepare to draw text with the font display lists."""
+        if self._font_base is None:
+            self._font_base = _compile_font(GLUT.GLUT_BITMAP_HELVETICA_10)
+        GL.glListBase(self._font_base)
 
     def restore_state(self):
         """Restore the state of the canvas when a new circuit definition file
@@ -927,12 +1656,12 @@ class MyGLCanvas_3D():
         self.pan_y = 0
         self.zoom = 1
         self.init = False
+        # The viewport may have been changed by the 2D mode
+        self._viewport_dirty = True
 
         # Restore initial viewing angle
-        GL.glMatrixMode(GL.GL_MODELVIEW)
-        GL.glLoadIdentity()
-        GL.glRotatef(20, 1, 0, 0)
-        GL.glRotatef(20, 0, 1, 0)
-        GL.glGetFloatv(GL.GL_MODELVIEW_MATRIX, self.scene_rotate)
+        rotation = _rotation_matrix(20, 1, 0, 0) @ \
+            _rotation_matrix(20, 0, 1, 0)
+        self._set_scene_rotate(rotation.T)
 
         self.render("Recenter canvas")
@@ -8,14 +8,12 @@ Classes
 -------
 Parser - parses the definition file and builds the logic network.
 """
-import wx
+import collections
+import itertools
 
-from names import Names
-from scanner import Scanner, Symbol
-from devices import Devices
-from network import Network
-from monitors import Monitors
 import wx
+
+from scanner import Symbol
 # add translation macro to builtin similar to what gettext does
 import builtins
 builtins.__dict__['_'] = wx.GetTranslation
@@ -43,12 +41,27 @@ class Parser:
     --------------
     parse_network(self): Parses the circuit definition file.
 
-    get_error_codes(self): Return the error codes list generated while
+    get_error_codes(self): Return the error codes generated while
                            running parse_network()
 
     All other methods are considered non public
     """
 
+    __slots__ = ('scanner', 'names', 'devices', 'network', 'monitors',
+                 'symbol', 'error_count', 'max_errors', 'error_codes',
+                 'error_lines', 'recovered_from_definition_error',
+                 'current_device',
+                 'current_number', 'identifier_ids', 'identifier_symbols',
+                 'current_name', 'current_port', 'outputs_list', 'inputs_list',
+                 'monitors_list', '_device_table', '_stop_kw_or_semi',
+                 '_stop_kw', '_stop_semi', '_reserved_types', '_input_ports',
+                 '_output_ports', '_error_table', '_next_symbol',
+                 '_file_end_symbols', '_skip_table', '_KEYWORD', '_DEVICE',
+                 '_PORT', '_NAME', '_NUMBER', '_COLON', '_SEMICOLON', '_COMMA',
+                 '_DEVICE_DEF', '_BRACKET_LEFT', '_BRACKET_RIGHT',
+                 '_CONNECTION_DEF', '_DOT', '_EOF', '_DEVICES_ID',
+                 '_CONNECTIONS_ID', '_MONITORS_ID', '_END_ID', '_I_ID')
+
     # Static variables to define error codes for availbility for unitests
     [SYNTAX_ERROR, UNDEFINED_DEVICE_ERROR, DEVICE_VALUE_ERROR,
      KEYWORD_ERROR, REPEATED_IDENTIFIER_ERROR, CONNECTION_INPUT_ERROR,
@@ -57,10 +70,17 @@ class Parser:
      MISSING_INPUTS_ERROR, REPEATED_INPUT_ERROR, INVALID_PORT_ERROR,
      NOT_GATE_ERROR, OUT_OF_BOUND_INPUTS_ERROR] = range(16)
 
+    # Symbols error() can skip to when recovering from an error
+    [STOP_KEYWORD_OR_SEMICOLON, STOP_KEYWORD, STOP_SEMICOLON, STOP_END,
+     STOP_EOF] = range(5)
+
     def __init__(self, names, devices, network, monitors, scanner):
         """Initialise constants."""
         # Initialise parameters as variables of class
         self.scanner = scanner
+        # Function returning the next symbol, reading the symbols
+        # scanned up front once parse_network() starts
+        self._next_symbol = scanner.get_symbol
         self.names = names
         self.devices = devices
         self.network = network
@@ -69,20 +89,182 @@ class Parser:
         self.symbol = Symbol()
         # Variable to store nº errors
         self.error_count = 0
-        # List of error codes used in get_error_codes
-        self.error_codes = []
+        # Parsing stops once this many errors have been found, must be at
+        # least 1
+        self.max_errors = 100
+        # Error codes used in get_error_codes, in the order they are found
+        self.error_codes = collections.deque()
+        # Lines of the error messages, printed at the end of parse_network
+        self.error_lines = []
         # Flag changed when an error is encountered and
         # set back to true when the parser recovers
         self.recovered_from_definition_error = True
         # Variables for  storing info for parsing
         self.current_device = Symbol()
         self.current_number = Symbol()
-        self.identifier_list = []
+        # Ids of the identifiers being defined, and their symbols which
+        # are only needed to report errors
+        self.identifier_ids = []
+        self.identifier_symbols = []
         self.current_name = Symbol()
         self.current_port = Symbol()
         self.outputs_list = []
         self.inputs_list = []
         self.monitors_list = []
+        # Scanner constants, kept on the parser so that each comparison
+        # needs a single attribute lookup
+        self._KEYWORD = scanner.KEYWORD
+        self._DEVICE = scanner.DEVICE
+        self._PORT = scanner.PORT
+        self._NAME = scanner.NAME
+        self._NUMBER = scanner.NUMBER
+        self._COLON = scanner.COLON
+        self._SEMICOLON = scanner.SEMICOLON
+        self._COMMA = scanner.COMMA
+        self._DEVICE_DEF = scanner.DEVICE_DEF
+        self._BRACKET_LEFT = scanner.BRACKET_LEFT
+        self._BRACKET_RIGHT = scanner.BRACKET_RIGHT
+        self._CONNECTION_DEF = scanner.CONNECTION_DEF
+        self._DOT = scanner.DOT
+        self._EOF = scanner.EOF
+        self._DEVICES_ID = scanner.DEVICES_ID
+        self._CONNECTIONS_ID = scanner.CONNECTIONS_ID
+        self._MONITORS_ID = scanner.MONITORS_ID
+        self._END_ID = scanner.END_ID
+        self._I_ID = scanner.I_ID
+        # Symbol types that stop skipping to a symbol or parsing a list
+        self._stop_kw_or_semi = frozenset(
+            (scanner.SEMICOLON, scanner.KEYWORD, scanner.EOF))
+        self._stop_kw = frozenset((scanner.KEYWORD, scanner.EOF))
+        self._stop_semi = frozenset((scanner.SEMICOLON, scanner.EOF))
+        # Symbol types of reserved words, which cannot be identifiers
+        self._reserved_types = frozenset(
+            (scanner.KEYWORD, scanner.DEVICE, scanner.PORT))
+        # Method skipping to each stopping symbol, indexed by the STOP_
+        # constants
+        self._skip_table = (self._skip_to_keyword_or_semicolon,
+                            self._skip_to_keyword, self._skip_to_semicolon,
+                            self._skip_to_end, self._skip_to_eof)
+        # Port ids that can only be inputs, and those that can only be
+        # outputs, checked in port()
+        self._input_ports = frozenset(
+            (scanner.I_ID, scanner.DATA_ID, scanner.CLK_ID, scanner.SET_ID,
+             scanner.CLEAR_ID))
+        self._output_ports = frozenset((scanner.Q_ID, scanner.QBAR_ID))
+        # Symbols closing the monitor list: (type, id or None if any id,
+        # expected symbol shown in the error message)
+        self._file_end_symbols = (
+            (scanner.KEYWORD, scanner.END_ID, "END"),
+            (scanner.SEMICOLON, None, ";"),
+            (scanner.EOF, None, "EOF"))
+        # How to make each device type: {device_id: (device_kind,
+        # default_number, same_as_default, {error: message})}. The device
+        # is made with default_number if no number or same_as_default is
+        # given, and the errors listed are reported with their message.
+        self._device_table = {
+            self.scanner.DTYPE_ID: (self.devices.D_TYPE, None, None, {
+                self.devices.QUALIFIER_PRESENT: _("DTYPE takes no number")}),
+            self.scanner.SWITCH_ID: (self.devices.SWITCH, 0, None, {
+                self.devices.INVALID_QUALIFIER:
+                    _("SWITCH takes only 0 or 1")}),
+            # A zero number is the only invalid one, as trying to define a
+            # negative number will give a syntax error as - is invalid
+            self.scanner.CLOCK_ID: (self.devices.CLOCK, 1, None, {
+                self.devices.INVALID_QUALIFIER:
+                    _("CLOCK takes only values greater than 0")}),
+            self.scanner.NAND_ID: (self.devices.NAND, 2, None, {
+                self.devices.INVALID_QUALIFIER:
+                    _("NAND gates can only have 1 to 16 inputs")}),
+            self.scanner.AND_ID: (self.devices.AND, 2, None, {
+                self.devices.INVALID_QUALIFIER:
+                    _("AND gates can only have 1 to 16 inputs")}),
+            self.scanner.NOR_ID: (self.devices.NOR, 2, None, {
+                self.devices.INVALID_QUALIFIER:
+                    _("NOR gates can only have 1 to 16 inputs")}),
+            self.scanner.OR_ID: (self.devices.OR, 2, None, {
+                self.devices.INVALID_QUALIFIER:
+                    _("OR gates can only have 1 to 16 inputs")}),
+            # XOR must have None in device_property, and 2 inputs
+            self.scanner.XOR_ID: (self.devices.XOR, None, 2, {
+                self.devices.QUALIFIER_PRESENT:
+                    _("XOR gates can only have 2 inputs")}),
+            self.scanner.SIGGEN_ID: (self.devices.SIGGEN, None, None, {
+                self.devices.NO_QUALIFIER:
+                    _("SIGGEN requires a parameter to be"
+                      "specified."),
+                self.devices.INVALID_QUALIFIER:
+                    _("SIGGEN requires a 4 or 8 followed by a "
+                      "binary number.")}),
+        }
+        # How to display each error: {error_type: (location, text, insert,
+        # text_end)}. The source line is shown for the current "symbol",
+        # for the symbol given as the "message", or not at all for None.
+        # The error text is text, followed by the "message" or the "name"
+        # of the message symbol if insert is set, and then by text_end.
+        self._error_table = {
+            self.SYNTAX_ERROR: (
+                "symbol", _("***SyntaxError: invalid syntax. Expected") + " ",
+                "message", ""),
+            self.DEVICE_VALUE_ERROR: (
+                "symbol", _("***ValueError:") + " ", "message", ""),
+            self.KEYWORD_ERROR: (
+                "symbol",
+                _("***NameError: Keywords, devices and ports names ") +
+                _("are reserved and cannot be used as identifiers."),
+                None, ""),
+            self.REPEATED_IDENTIFIER_ERROR: (
+                "message", _("***NameError: The identifier "), "name",
+                _(" was repeated. All identifiers must have unique names.")),
+            self.CONNECTION_INPUT_ERROR: (
+                "symbol",
+                _("***TypeError: Inputs must be on the right") +
+                _(" hand side of the connection definition"), None, ""),
+            self.OUTPUT_ERROR: (
+                "symbol",
+                _("***TypeError: Outputs must be on the left") +
+                _(" hand side of the connection definition"), None, ""),
+            self.MONITOR_INPUT_ERROR: (
+                "symbol", _("***TypeError: Monitors can only be outputs."),
+                None, ""),
+            self.REPEATED_MONITOR_ERROR: (
+                "message", _("***NameError: The monitor "), "name",
+                _(" was repeated. All monitors must be unique.")),
+            self.INVALID_DEVICE_OUTPUT_ERROR: (
+                "message",
+                _("***AttributeError: The device has no such output."),
+                None, ""),
+            self.UNDEFINED_DEVICE_ERROR: (
+                "message", _("***NameError: The device "), "name",
+                _(" has not been previously defined in DEVICES.")),
+            self.UNMATCHED_INPUT_OUTPUT_ERROR: (
+                "symbol",
+                _("***TypeError: The number of inputs and outputs ") +
+                _("must match unless you are specifying one output to") +
+                _(" many inputs or all the inputs of a device at once"),
+                None, ""),
+            self.REPEATED_INPUT_ERROR: (
+                "message", _("***ValueError: The input "), "name",
+                _(" has already been specified previously. Repeated ") +
+                _(" assignment of inputs is not allowed.")),
+            self.INVALID_PORT_ERROR: (
+                "message", _("***AttributeError: The port "), "name",
+                _(" specified does not exist for such device or ") +
+                _("is out of bounds")),
+            self.NOT_GATE_ERROR: (
+                "symbol",
+                _("***TypeError: Only gates can have simultaneous ") +
+                _("assignment of all of its inputs."), None, ""),
+            self.OUT_OF_BOUND_INPUTS_ERROR: (
+                "symbol",
+                _("***TypeError: Too many or too few inputs ") +
+                _("have been assigned simultaneously to the device.") +
+                _(" When using simultaneous defintion the same number") +
+                _(" of inputs as the device has must be given."), None, ""),
+            self.MISSING_INPUTS_ERROR: (
+                None,
+                _("***SystemError: Some inputs have not been specificed") +
+                _(" for these devices: "), "message", ""),
+        }
 
     def parse_network(self):
         """ Parse the circuit definition file.
@@ -90,7 +272,16 @@ class Parser:
         The EBNF grammar is:
         device_list, connection_list, [ monitor_list ] ;
         """
-        self.symbol = self.scanner.get_symbol()
+        # With no errors allowed, no error could be recorded and skipped
+        # past, and the lists would never stop parsing
+        if self.max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        symbols = self.scanner.tokenize_all()
+        # Like the scanner, keep returning the EOF symbol once the end of
+        # the file is reached
+        self._next_symbol = itertools.chain(
+            symbols, itertools.repeat(symbols[-1])).__next__
+        self.symbol = self._next_symbol()
         self.device_list()
         self.connection_list()
         # Check for EOF inside monitors_list if MONITORS not given
@@ -99,7 +290,9 @@ class Parser:
             return True
         else:
             # Error message
-            print(_("Number of errors encountered:"), self.error_count)
+            self.error_lines.append("{} {}".format(
+                _("Number of errors encountered:"), self.error_count))
+            print("\n".join(self.error_lines))
             return False
 
     def device_list(self):
@@ -109,47 +302,8 @@ class Parser:
         "DEVICES", ":", device_definition, { device_definition },
         "END", ";" ;
         """
-        # Must check that its both a KEYWORD and the correct id as for
-        # example numbers can have the same id as DEVICES_ID.
-        if (self.symbol.type == self.scanner.KEYWORD and
-           self.symbol.id == self.scanner.DEVICES_ID):
-            self.symbol = self.scanner.get_symbol()
-            if(self.symbol.type == self.scanner.COLON):
-                self.symbol = self.scanner.get_symbol()
-                # Ensure all variables and lists are empty
-                self.clear_all()
-                self.device_definition()
-                while (self.symbol.type != self.scanner.KEYWORD and
-                       self.symbol.type != self.scanner.EOF):
-                    # If it has returned to the while loop it must
-                    # have recovered from the error during device_definition.
-                    self.recovered_from_definition_error = True
-                    # Ensure all variables and lists are empty
-                    self.clear_all()
-                    self.device_definition()
-                # Recovered from error as KEYWORD or EOF found
-                self.recovered_from_definition_error = True
-                if (self.symbol.id == self.scanner.END_ID and
-                        self.symbol.type == self.scanner.KEYWORD):
-                    self.symbol = self.scanner.get_symbol()
-                    if (self.symbol.type == self.scanner.SEMICOLON):
-                        self.symbol = self.scanner.get_symbol()
-                    else:
-                        # Recover to KEYWORD so it can parse CONNECTIONS
-                        self.error(self.SYNTAX_ERROR, ";",
-                                   stopping_symbol="KEYWORD")
-                else:
-                    # Recover to KEYWORD so it can parse CONNECTIONS
-                    self.error(self.SYNTAX_ERROR, "END",
-                               stopping_symbol="KEYWORD")
-            else:
-                # Recover to END so it can parse CONNECTIONS
-                self.error(self.SYNTAX_ERROR, ":",
-                           stopping_symbol="END")
-        else:
-            # Recover to END so it can parse CONNECTIONS
-            self.error(self.SYNTAX_ERROR, "DEVICES",
-                       stopping_symbol="END")
+        self._parse_section(self._DEVICES_ID, "DEVICES",
+                            self.device_definition)
 
     def connection_list(self):
         """Parse a connection list.
@@ -158,68 +312,82 @@ class Parser:
         "CONNECTIONS", ":", connection_definition,
         { connection_definition }, "END", ";" ;
         """
+        if not self._parse_section(self._CONNECTIONS_ID,
+                                   "CONNECITIONS",
+                                   self.connection_definition):
+            return
+        # Only throw missing inputs if no errors occured
+        # previously as probably missing ip from errors.
+        if ((not self.network.check_network()) and
+                self.error_count == 0):
+            # Store all the device names in a string
+            devices = ""
+            # Iterate over all devices
+            for device_id in self.devices.find_devices():
+                device = self.devices.get_device(device_id)
+                for input_id in device.inputs:
+                    # Check if the input has a connection
+                    if (self.network.get_connected_output(
+                            device_id, input_id) is None):
+                        # Add device to missing inputs string
+                        devices = devices + \
+                            self.names.get_name_string(device_id) + " "
+                        # Move to next device
+                        break
+            self.error(self.MISSING_INPUTS_ERROR, message=devices,
+                       stopping_symbol=None)
+
+    def _parse_section(self, keyword_id, keyword, definition):
+        """Parse a section made of a keyword, ":", one or more definitions
+        parsed by definition, "END" and ";".
+
+        Return True if the section was closed by "END", ";". On an error
+        the parser recovers to the keyword of the next section.
+        """
         # Must check that its both a KEYWORD and the correct id as for
         # example numbers can have the same id as DEVICES_ID.
-        if (self.symbol.type == self.scanner.KEYWORD and
-           self.symbol.id == self.scanner.CONNECTIONS_ID):
-            self.symbol = self.scanner.get_symbol()
-            if(self.symbol.type == self.scanner.COLON):
-                self.symbol = self.scanner.get_symbol()
+        if (self.symbol.type == self._KEYWORD and
+           self.symbol.id == keyword_id):
+            self.symbol = self._next_symbol()
+            if(self.symbol.type == self._COLON):
+                self.symbol = self._next_symbol()
                 # Ensure all variables and lists are empty
                 self.clear_all()
-                self.connection_definition()
-                while (self.symbol.type != self.scanner.KEYWORD and
-                       self.symbol.type != self.scanner.EOF):
-                    self.clear_all()
+                definition()
+                stop_types = self._stop_kw
+                while self.symbol.type not in stop_types:
                     # If it has returned to the while loop it must
-                    # have recovered from the error during device_definition.
+                    # have recovered from the error during the definition.
                     self.recovered_from_definition_error = True
-                    self.connection_definition()
+                    # Ensure all variables and lists are empty
+                    self.clear_all()
+                    definition()
                 # Recovered from error as KEYWORD or EOF found
                 self.recovered_from_definition_error = True
-                if (self.symbol.id == self.scanner.END_ID and
-                        self.symbol.type == self.scanner.KEYWORD):
-                    self.symbol = self.scanner.get_symbol()
-                    if (self.symbol.type == self.scanner.SEMICOLON):
-                        # Only throw missing inputs if no errors occured
-                        # previously as probably missing ip from errors.
-                        if ((not self.network.check_network()) and
-                                self.error_count == 0):
-                            # Store all the device names in a string
-                            devices = ""
-                            # Iterate over all devices
-                            for device_id in self.devices.find_devices():
-                                device = self.devices.get_device(device_id)
-                                for input_id in device.inputs:
-                                    # Check if the input has a connection
-                                    if (self.network.get_connected_output(
-                                            device_id, input_id) is None):
-                                        # Add device to missing inputs string
-                                        devices = devices + \
-                                            self.names.get_name_string(
-                                                device_id) + " "
-                                        # Move to next device
-                                        break
-                            self.error(self.MISSING_INPUTS_ERROR,
-                                       message=devices,
-                                       stopping_symbol=None)
-                        self.symbol = self.scanner.get_symbol()
+                if (self.symbol.id == self._END_ID and
+                        self.symbol.type == self._KEYWORD):
+                    self.symbol = self._next_symbol()
+                    if (self.symbol.type == self._SEMICOLON):
+                        self.symbol = self._next_symbol()
+                        return True
                     else:
-                        # Recover to KEYWORD so it can parse MONITORS
+                        # Recover to KEYWORD so it can parse the next
+                        # section
                         self.error(self.SYNTAX_ERROR, ";",
-                                   stopping_symbol="KEYWORD")
+                                   stopping_symbol=self.STOP_KEYWORD)
                 else:
-                    # Recover to KEYWORD so it can parse MONITORS
+                    # Recover to KEYWORD so it can parse the next section
                     self.error(self.SYNTAX_ERROR, "END",
-                               stopping_symbol="KEYWORD")
+                               stopping_symbol=self.STOP_KEYWORD)
             else:
-                # Recover to END so it can parse MONITORS
+                # Recover to END so it can parse the next section
                 self.error(self.SYNTAX_ERROR, ":",
-                           stopping_symbol="END")
+                           stopping_symbol=self.STOP_END)
         else:
-            # Recover to END so it can parse MONITORS
-            self.error(self.SYNTAX_ERROR, "CONNECITIONS",
-                       stopping_symbol="END")
+            # Recover to END so it can parse the next section
+            self.error(self.SYNTAX_ERROR, keyword,
+                       stopping_symbol=self.STOP_END)
+        return False
 
     def monitor_list(self):
         """Parse a connection list.
@@ -229,71 +397,59 @@ class Parser:
         """
         # Must check that its both a KEYWORD and the correct id as for
         # example numbers can have the same id as DEVICES_ID.
-        if (self.symbol.type == self.scanner.KEYWORD and
-           self.symbol.id == self.scanner.MONITORS_ID):
-            self.symbol = self.scanner.get_symbol()
-            if(self.symbol.type == self.scanner.COLON):
-                self.symbol = self.scanner.get_symbol()
+        if (self.symbol.type == self._KEYWORD and
+           self.symbol.id == self._MONITORS_ID):
+            self.symbol = self._next_symbol()
+            if(self.symbol.type == self._COLON):
+                self.symbol = self._next_symbol()
                 # Ensure all variables and lists are empty
                 self.clear_all()
                 # The signals on monitors should be only outputs
                 self.monitors_list.append(self.signal("M"))
-                while (self.symbol.type == self.scanner.COMMA and
-                       self.recovered_from_definition_error):
+                recovered = self.recovered_from_definition_error
+                COMMA = self._COMMA
+                get_symbol = self._next_symbol
+                append_monitor = self.monitors_list.append
+                while recovered and self.symbol.type == COMMA:
                     self.clear_vars()
-                    self.symbol = self.scanner.get_symbol()
-                    self.monitors_list.append(self.signal("M"))
-                if (self.symbol.type == self.scanner.SEMICOLON):
+                    self.symbol = get_symbol()
+                    append_monitor(self.signal("M"))
+                    recovered = self.recovered_from_definition_error
+                if (self.symbol.type == self._SEMICOLON):
                     # Only make monitors if count is zero
                     if(self.error_count == 0):
                         self.make_monitors()
-                    self.symbol = self.scanner.get_symbol()
-                    if (self.symbol.id == self.scanner.END_ID and
-                            self.symbol.type == self.scanner.KEYWORD):
-                        self.symbol = self.scanner.get_symbol()
-                        if (self.symbol.type == self.scanner.SEMICOLON):
-                            self.symbol = self.scanner.get_symbol()
-                            if(self.symbol.type == self.scanner.EOF):
-                                pass
-                            else:
-                                self.error(self.SYNTAX_ERROR, "EOF",
-                                           skipt_to_symbol="EOF")
-                        else:
-                            self.error(self.SYNTAX_ERROR, ";",
-                                       stopping_symbol="EOF")
-                    else:
-                        self.error(self.SYNTAX_ERROR, "END",
-                                   stopping_symbol="EOF")
-                elif(not self.recovered_from_definition_error):
+                    self.symbol = self._next_symbol()
+                elif(recovered):
+                    self.error(self.SYNTAX_ERROR, ";",
+                               stopping_symbol=self.STOP_END)
+                    return
+                else:
                     # Check that monitors has END; if error encountered
                     self.recovered_from_definition_error = True
-                    if (self.symbol.id == self.scanner.END_ID and
-                            self.symbol.type == self.scanner.KEYWORD):
-                        self.symbol = self.scanner.get_symbol()
-                        if (self.symbol.type == self.scanner.SEMICOLON):
-                            self.symbol = self.scanner.get_symbol()
-                            if(self.symbol.type == self.scanner.EOF):
-                                pass
-                            else:
-                                self.error(self.SYNTAX_ERROR, "EOF",
-                                           skipt_to_symbol="EOF")
-                        else:
-                            self.error(self.SYNTAX_ERROR, ";",
-                                       stopping_symbol="EOF")
-                    else:
-                        self.error(self.SYNTAX_ERROR, "END",
-                                   stopping_symbol="EOF")
-                else:
-                    self.error(self.SYNTAX_ERROR, ";",
-                               stopping_symbol="END")
+                self.file_end()
             else:
                 self.error(self.SYNTAX_ERROR, ":",
-                           stopping_symbol="END")
-        elif(self.symbol.type == self.scanner.EOF):
+                           stopping_symbol=self.STOP_END)
+        elif(self.symbol.type == self._EOF):
             pass
         else:
             self.error(self.SYNTAX_ERROR, "MONITORS OR EOF",
-                       stopping_symbol="EOF")
+                       stopping_symbol=self.STOP_EOF)
+
+    def file_end(self):
+        """Parse the end of the monitor list and of the file.
+
+        The EBNF grammar is the following:
+        "END", ";", EOF ;
+        """
+        for symbol_type, symbol_id, expected in self._file_end_symbols:
+            if (self.symbol.type != symbol_type or
+                    symbol_id is not None and self.symbol.id != symbol_id):
+                self.error(self.SYNTAX_ERROR, expected,
+                           stopping_symbol=self.STOP_EOF)
+                return
+            self.symbol = self._next_symbol()
 
     def device_definition(self):
         """Parse a device defintion.
@@ -305,43 +461,48 @@ class Parser:
         self.identifier()
         # Throught device definition only enter if statements and while
         # loops if we have recovered from an error. Equivalent to
-        # stop parsing device_definition if an error occurs.
-        while (self.symbol.type == self.scanner.COMMA and
-               self.recovered_from_definition_error):
-            self.symbol = self.scanner.get_symbol()
-            self.identifier()
-        if (self.symbol.type == self.scanner.DEVICE_DEF and
-                self.recovered_from_definition_error):
-            self.symbol = self.scanner.get_symbol()
+        # stop parsing device_definition if an error occurs. The flag is
+        # re-read after every call that can report an error.
+        recovered = self.recovered_from_definition_error
+        COMMA = self._COMMA
+        get_symbol = self._next_symbol
+        identifier = self.identifier
+        while recovered and self.symbol.type == COMMA:
+            self.symbol = get_symbol()
+            identifier()
+            recovered = self.recovered_from_definition_error
+        if (recovered and self.symbol.type == self._DEVICE_DEF):
+            self.symbol = self._next_symbol()
             self.device_type()
-            if (self.symbol.type == self.scanner.BRACKET_LEFT and
-                    self.recovered_from_definition_error):
-                self.symbol = self.scanner.get_symbol()
+            recovered = self.recovered_from_definition_error
+            if (recovered and self.symbol.type == self._BRACKET_LEFT):
+                self.symbol = self._next_symbol()
                 self.number()
-                if(self.symbol.type == self.scanner.BRACKET_RIGHT and
-                   self.recovered_from_definition_error):
-                    self.symbol = self.scanner.get_symbol()
+                recovered = self.recovered_from_definition_error
+                if(recovered and
+                   self.symbol.type == self._BRACKET_RIGHT):
+                    self.symbol = self._next_symbol()
                 else:
                     self.error(self.SYNTAX_ERROR, ")")
+                    recovered = self.recovered_from_definition_error
             # If the symbol is not a bracket but a number must
             # be missing left bracket from grammar.
-            elif (self.symbol.type == self.scanner.NUMBER and
-                  self.recovered_from_definition_error):
+            elif (recovered and self.symbol.type == self._NUMBER):
                 self.error(self.SYNTAX_ERROR, "(")
+                recovered = self.recovered_from_definition_error
             else:
                 # If no number specified in file set variable current_number
                 # by default to an empty symbol.
                 self.current_number = Symbol()
-            if (self.symbol.type == self.scanner.SEMICOLON and
-                    self.recovered_from_definition_error):
+            if (recovered and self.symbol.type == self._SEMICOLON):
                 # Making devices does not break if errors have occured
                 # previously but not during device_definition
                 self.make_devices()
-                self.symbol = self.scanner.get_symbol()
+                self.symbol = self._next_symbol()
             else:
                 self.error(self.SYNTAX_ERROR, ";")
         # From grammar name followed by name possibly indicates mising coma
-        elif (self.symbol.type == self.scanner.NAME):
+        elif (self.symbol.type == self._NAME):
             self.error(self.SYNTAX_ERROR, ",")
         else:
             self.error(self.SYNTAX_ERROR, ":=")
@@ -356,36 +517,43 @@ class Parser:
         self.clear_vars()
         # The signals on the left hand side should be outputs
         self.outputs_list.append(self.signal("O"))
-        while (self.symbol.type == self.scanner.COMMA and
-               self.recovered_from_definition_error):
-            self.clear_vars()
-            self.symbol = self.scanner.get_symbol()
-            self.outputs_list.append(self.signal("O"))
-        if (self.symbol.type == self.scanner.CONNECTION_DEF and
-                self.recovered_from_definition_error):
-            self.symbol = self.scanner.get_symbol()
+        # The flag is re-read after every signal, as it can report an error
+        recovered = self.recovered_from_definition_error
+        COMMA = self._COMMA
+        get_symbol = self._next_symbol
+        clear_vars = self.clear_vars
+        signal = self.signal
+        append_output = self.outputs_list.append
+        while recovered and self.symbol.type == COMMA:
+            clear_vars()
+            self.symbol = get_symbol()
+            append_output(signal("O"))
+            recovered = self.recovered_from_definition_error
+        if (recovered and self.symbol.type == self._CONNECTION_DEF):
+            self.symbol = self._next_symbol()
             self.clear_vars()
             self.inputs_list.append(self.signal("I"))
-            while (self.symbol.type == self.scanner.COMMA and
-                   self.recovered_from_definition_error):
-                self.clear_vars()
-                self.symbol = self.scanner.get_symbol()
+            recovered = self.recovered_from_definition_error
+            append_input = self.inputs_list.append
+            while recovered and self.symbol.type == COMMA:
+                clear_vars()
+                self.symbol = get_symbol()
                 # The signals on the right hand side should be inputs
-                self.inputs_list.append(self.signal("I"))
-            if (self.symbol.type == self.scanner.SEMICOLON and
-                    self.recovered_from_definition_error):
+                append_input(signal("I"))
+                recovered = self.recovered_from_definition_error
+            if (recovered and self.symbol.type == self._SEMICOLON):
                 # Only make connection if there have been no errors
                 # or might through unexpected errors
                 if (self.error_count == 0):
                     self.make_connection()
-                self.symbol = self.scanner.get_symbol()
+                self.symbol = self._next_symbol()
             # From grammar name followed by name possibly indicates mising coma
-            elif (self.symbol.type == self.scanner.NAME):
+            elif (self.symbol.type == self._NAME):
                 self.error(self.SYNTAX_ERROR, ",")
             else:
                 self.error(self.SYNTAX_ERROR, ";")
         # From grammar name followed by name possibly indicates mising coma
-        elif (self.symbol.type == self.scanner.NAME):
+        elif (self.symbol.type == self._NAME):
             self.error(self.SYNTAX_ERROR, ",")
         else:
             self.error(self.SYNTAX_ERROR, "=>")
@@ -393,7 +561,8 @@ class Parser:
     def clear_all(self):
         """Clear all symbols and lists used during parsing."""
         self.clear_vars()
-        self.identifier_list = []
+        self.identifier_ids = []
+        self.identifier_symbols = []
         self.outputs_list = []
         self.inputs_list = []
         self.monitors_list = []
@@ -405,143 +574,115 @@ class Parser:
         self.current_name = Symbol()
         self.current_port = Symbol()
 
-    def error(self, error_type, message=None, stopping_symbol="KEYWORD or ;"):
-        """Calls function to display and record error."""
+    def error(self, error_type, message=None,
+              stopping_symbol=STOP_KEYWORD_OR_SEMICOLON):
+        """Calls function to display and record error.
+
+        stopping_symbol is one of the STOP_ constants, or None to not skip
+        any symbols.
+        """
         # Only record error if it has recovered from any previous errors
-        if (self.recovered_from_definition_error):
-            self.error_count += 1
-            self.error_codes.append(error_type)
-            self.display_error(error_type, message)
+        # and parsing has not been stopped by reaching max_errors. As
+        # max_errors is at least 1, the first error is always recorded.
+        if (not self.recovered_from_definition_error or
+                self.error_count >= self.max_errors):
+            return
+        self.error_count += 1
+        self.error_codes.append(error_type)
+        self.display_error(error_type, message)
+        if (self.error_count >= self.max_errors):
+            # Skip the rest of the file, so that every list stops
+            self.error_lines.append(_("Too many errors, parsing stopped."))
+            self.symbol = Symbol()
+            self.symbol.type = self._EOF
+            self._next_symbol = itertools.repeat(self.symbol).__next__
+        else:
             self.skip_to_stopping_symbol(stopping_symbol)
 
     def display_error(self, error_type, message):
         """Display specific error depending on error_type."""
-        if (error_type == self.SYNTAX_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***SyntaxError: invalid syntax. Expected"), message)
-        elif (error_type == self.DEVICE_VALUE_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***ValueError:"), message)
-        elif (error_type == self.KEYWORD_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***NameError: Keywords, devices and ports names ") +
-                  _("are reserved and cannot be used as identifiers."))
-        elif (error_type == self.REPEATED_IDENTIFIER_ERROR):
-            print("Line: {}".format(message.line))
-            self.scanner.get_error_line(message)
-            print(_("***NameError: The identifier ") +
-                  self.names.get_name_string(message.id) +
-                  _(" was repeated. All identifiers must have unique names."))
-        elif (error_type == self.CONNECTION_INPUT_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***TypeError: Inputs must be on the right") +
-                  _(" hand side of the connection definition"))
-        elif (error_type == self.OUTPUT_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***TypeError: Outputs must be on the left") +
-                  _(" hand side of the connection definition"))
-        elif (error_type == self.MONITOR_INPUT_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***TypeError: Monitors can only be outputs."))
-        elif (error_type == self.REPEATED_MONITOR_ERROR):
-            print("Line: {}".format(message.line))
-            self.scanner.get_error_line(message)
-            print(_("***NameError: The monitor ") +
-                  self.names.get_name_string(message.id) +
-                  _(" was repeated. All monitors must be unique."))
-        elif (error_type == self.INVALID_DEVICE_OUTPUT_ERROR):
-            print("Line: {}".format(message.line))
-            self.scanner.get_error_line(message)
-            print(_("***AttributeError: The device has no such output."))
-        elif (error_type == self.UNDEFINED_DEVICE_ERROR):
-            print("Line: {}".format(message.line))
-            self.scanner.get_error_line(message)
-            print(_("***NameError: The device ") +
-                  self.names.get_name_string(message.id) +
-                  _(" has not been previously defined in DEVICES."))
-        elif (error_type == self.UNMATCHED_INPUT_OUTPUT_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***TypeError: The number of inputs and outputs ") +
-                  _("must match unless you are specifying one output to") +
-                  _(" many inputs or all the inputs of a device at once"))
-        elif (error_type == self.REPEATED_INPUT_ERROR):
-            print("Line: {}".format(message.line))
-            self.scanner.get_error_line(message)
-            print(_("***ValueError: The input ") +
-                  self.names.get_name_string(message.id) +
-                  _(" has already been specified previously. Repeated ") +
-                  _(" assignment of inputs is not allowed."))
-        elif (error_type == self.INVALID_PORT_ERROR):
-            print("Line: {}".format(message.line))
-            self.scanner.get_error_line(message)
-            print(_("***AttributeError: The port ") +
-                  self.names.get_name_string(message.id) +
-                  _(" specified does not exist for such device or ") +
-                  _("is out of bounds"))
-        elif (error_type == self.NOT_GATE_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***TypeError: Only gates can have simultaneous ") +
-                  _("assignment of all of its inputs."))
-        elif (error_type == self.OUT_OF_BOUND_INPUTS_ERROR):
-            print("Line: {}".format(self.symbol.line))
-            self.scanner.get_error_line(self.symbol)
-            print(_("***TypeError: Too many or too few inputs ") +
-                  _("have been assigned simultaneously to the device.") +
-                  _(" When using simultaneous defintion the same number") +
-                  _(" of inputs as the device has must be given."))
-        elif (error_type == self.MISSING_INPUTS_ERROR):
-            print(_("***SystemError: Some inputs have not been specificed") +
-                  _(" for these devices: ") + message)
+        location, text, insert, text_end = self._error_table[error_type]
+        if location is not None:
+            # The error is either at the current symbol or at the symbol
+            # given as the message
+            symbol = self.symbol if location == "symbol" else message
+            self.error_lines.append("Line: {}".format(symbol.line))
+            self.error_lines.append(self.scanner.format_error_line(symbol))
+        if insert == "message":
+            text += message
+        elif insert == "name":
+            text += self.names.get_name_string(message.id)
+        self.error_lines.append(text + text_end)
 
     def skip_to_stopping_symbol(self, stopping_symbol):
         """Use scanner to skip to stopping_symbol specificed."""
-        # KEYWORD or ; if the default
-        if (stopping_symbol == "KEYWORD or ;"):
-            # Not fully recovered by skipping to symbol
-            self.recovered_from_definition_error = False
-            while (self.symbol.type != self.scanner.SEMICOLON and
-                   self.symbol.type != self.scanner.KEYWORD and
-                   self.symbol.type != self.scanner.EOF):
-                self.symbol = self.scanner.get_symbol()
-            if self.symbol.type == self.scanner.SEMICOLON:
-                self.symbol = self.scanner.get_symbol()
-        elif (stopping_symbol == "KEYWORD"):
-            while (self.symbol.type != self.scanner.KEYWORD and
-                   self.symbol.type != self.scanner.EOF):
-                self.symbol = self.scanner.get_symbol()
-        elif (stopping_symbol == ";"):
-            # Not fully recovered by skipping to symbol
-            self.recovered_from_definition_error = False
-            while (self.symbol.type != self.scanner.SEMICOLON and
-                   self.symbol.type != self.scanner.EOF):
-                self.symbol = self.scanner.get_symbol()
-            self.symbol = self.scanner.get_symbol()
-        elif (stopping_symbol == "END"):
-            while ((self.symbol.type != self.scanner.KEYWORD or
-                    self.symbol.id != self.scanner.END_ID) and
-                   self.symbol.type != self.scanner.EOF):
-                self.symbol = self.scanner.get_symbol()
-            if (self.symbol.type == self.scanner.EOF):
-                self.error(self.SYNTAX_ERROR, "END")
+        if stopping_symbol is not None:
+            self._skip_table[stopping_symbol]()
+
+    def _skip_to_keyword_or_semicolon(self):
+        """Skip to the next KEYWORD, or past the next ;"""
+        # Not fully recovered by skipping to symbol
+        self.recovered_from_definition_error = False
+        get_symbol = self._next_symbol
+        stop_types = self._stop_kw_or_semi
+        # The symbol is kept in a local variable while skipping, and
+        # stored back before returning
+        symbol = self.symbol
+        while symbol.type not in stop_types:
+            symbol = get_symbol()
+        if symbol.type == self._SEMICOLON:
+            symbol = get_symbol()
+        self.symbol = symbol
+
+    def _skip_to_keyword(self):
+        """Skip to the next KEYWORD."""
+        get_symbol = self._next_symbol
+        stop_types = self._stop_kw
+        symbol = self.symbol
+        while symbol.type not in stop_types:
+            symbol = get_symbol()
+        self.symbol = symbol
+
+    def _skip_to_semicolon(self):
+        """Skip past the next ;"""
+        # Not fully recovered by skipping to symbol
+        self.recovered_from_definition_error = False
+        get_symbol = self._next_symbol
+        stop_types = self._stop_semi
+        symbol = self.symbol
+        while symbol.type not in stop_types:
+            symbol = get_symbol()
+        self.symbol = get_symbol()
+
+    def _skip_to_end(self):
+        """Skip past the next END and the ; following it."""
+        get_symbol = self._next_symbol
+        # Stop at EOF, or at a KEYWORD if it is END
+        KEYWORD = self._KEYWORD
+        END_ID = self._END_ID
+        stop_types = self._stop_kw
+        symbol = self.symbol
+        while symbol.type not in stop_types or (
+                symbol.type == KEYWORD and symbol.id != END_ID):
+            symbol = get_symbol()
+        if (symbol.type == self._EOF):
+            self.symbol = symbol
+            self.error(self.SYNTAX_ERROR, "END")
+        else:
+            self.symbol = get_symbol()
+            if (self.symbol.type == self._SEMICOLON):
+                self.symbol = get_symbol()
             else:
-                self.symbol = self.scanner.get_symbol()
-                if (self.symbol.type == self.scanner.SEMICOLON):
-                    self.symbol = self.scanner.get_symbol()
-                else:
-                    self.error(self.SYNTAX_ERRPR, ";")
-        elif (stopping_symbol == "EOF"):
-            while (self.symbol.type != self.scanner.EOF):
-                self.symbol = self.scanner.get_symbol()
-        elif (stopping_symbol is None):
-            pass
+                self.error(self.SYNTAX_ERROR, ";")
+
+    def _skip_to_eof(self):
+        """Skip to the end of the file."""
+        get_symbol = self._next_symbol
+        EOF = self._EOF
+        symbol = self.symbol
+        while (symbol.type != EOF):
+            symbol = get_symbol()
+        self.symbol = symbol
 
     def make_monitors(self):
         """Make monitors using signals in monitors_list."""
@@ -570,12 +711,12 @@ class Parser:
                port or ouptut port during connection definition
                or if it is a monitor port.
         """
-        if (self.symbol.type == self.scanner.NAME and
+        if (self.symbol.type == self._NAME and
                 self.recovered_from_definition_error):
             self.current_name = self.symbol
-            self.symbol = self.scanner.get_symbol()
-            if(self.symbol.type == self.scanner.DOT):
-                self.symbol = self.scanner.get_symbol()
+            self.symbol = self._next_symbol()
+            if(self.symbol.type == self._DOT):
+                self.symbol = self._next_symbol()
                 self.port(I_O_M)
             return (self.current_name, self.current_port)
         else:
@@ -591,198 +732,94 @@ class Parser:
                or if it is a monitor port.
         """
         # Outputs and monitors cannot be input ports
-        if (self.symbol.type == self.scanner.PORT and
+        if (self.symbol.type == self._PORT and
             (I_O_M == "O" or I_O_M == "M") and
-            (self.symbol.id == self.scanner.I_ID or
-             self.symbol.id == self.scanner.DATA_ID or
-             self.symbol.id == self.scanner.CLK_ID or
-             self.symbol.id == self.scanner.SET_ID or
-             self.symbol.id == self.scanner.CLEAR_ID)):
+                self.symbol.id in self._input_ports):
             if (I_O_M == "O"):
                 self.error(self.CONNECTION_INPUT_ERROR)
             elif (I_O_M == "M"):
                 self.error(self.MONITOR_INPUT_ERROR)
         # Inputs cannot have output ports
-        elif (self.symbol.type == self.scanner.PORT and
-              I_O_M == "I" and (self.symbol.id == self.scanner.Q_ID or
-                                self.symbol.id == self.scanner.QBAR_ID)):
+        elif (self.symbol.type == self._PORT and
+              I_O_M == "I" and self.symbol.id in self._output_ports):
             self.error(self.OUTPUT_ERROR)
         # If its and I port save the number as the port
-        elif (self.symbol.id == self.scanner.I_ID and
-              self.symbol.type == self.scanner.PORT and
+        elif (self.symbol.id == self._I_ID and
+              self.symbol.type == self._PORT and
               self.recovered_from_definition_error):
-            self.symbol = self.scanner.get_symbol()
+            self.symbol = self._next_symbol()
             self.number()
             self.current_port = self.current_number
         # If it is another type of port save that symbol as the port
-        elif (self.symbol.type == self.scanner.PORT and
+        elif (self.symbol.type == self._PORT and
               self.recovered_from_definition_error):
             self.current_port = self.symbol
-            self.symbol = self.scanner.get_symbol()
+            self.symbol = self._next_symbol()
         else:
             self.error(self.SYNTAX_ERROR, "port")
 
     def number(self):
         """Parse a number."""
         # Only parse if recovered from an error
-        if (self.symbol.type == self.scanner.NUMBER and
+        if (self.symbol.type == self._NUMBER and
            self.recovered_from_definition_error):
             self.current_number = self.symbol
-            self.symbol = self.scanner.get_symbol()
+            self.symbol = self._next_symbol()
         else:
             self.error(self.SYNTAX_ERROR, "number")
 
     def identifier(self):
         """Parse an identifier."""
         # Only parse if recoverd from the error
-        if (self.symbol.type == self.scanner.NAME and
+        if (self.symbol.type == self._NAME and
                 self.recovered_from_definition_error):
-            self.identifier_list.append(self.symbol)
-            self.symbol = self.scanner.get_symbol()
+            self.identifier_ids.append(self.symbol.id)
+            self.identifier_symbols.append(self.symbol)
+            self.symbol = self._next_symbol()
         # If symbol is KEYWORD, DEVICE or PORT raise semantic error
-        elif((self.symbol.type == self.scanner.KEYWORD or
-              self.symbol.type == self.scanner.DEVICE or
-              self.symbol.type == self.scanner.PORT) and
+        elif(self.symbol.type in self._reserved_types and
              self.recovered_from_definition_error):
-            self.error(self.KEYWORD_ERROR, stopping_symbol=";")
+            self.error(self.KEYWORD_ERROR, stopping_symbol=self.STOP_SEMICOLON)
         else:
             self.error(self.SYNTAX_ERROR, "identifier")
 
     def device_type(self):
         """Parse a device."""
         # Only parse if recovered from an error
-        if (self.symbol.type == self.scanner.DEVICE and
+        if (self.symbol.type == self._DEVICE and
                 self.recovered_from_definition_error):
             self.current_device = self.symbol
-            self.symbol = self.scanner.get_symbol()
+            self.symbol = self._next_symbol()
         else:
             self.error(self.SYNTAX_ERROR, "device")
 
     def make_devices(self):
-        """Make specified device for each identifier in identifier_list."""
-        for identifier in self.identifier_list:
+        """Make specified device for each identifier in identifier_ids."""
+        # Invalid device error already checked in device_type()
+        entry = self._device_table.get(self.current_device.id)
+        if entry is None:
+            return
+        device_kind, default_number, same_as_default, errors = entry
+        number = self.current_number.id
+        if number is None or number == same_as_default:
+            number = default_number
+        has_device = self.devices.has_device
+        for index, identifier_id in enumerate(self.identifier_ids):
             # Check for repeated identifiers
-            if (self.devices.get_device(identifier.id) is not None):
+            if (has_device(identifier_id)):
                 # Should not skip to a symbol as currently at ;
                 # Applies to all the errors called in make_devices()
                 self.error(self.REPEATED_IDENTIFIER_ERROR,
-                           identifier, None)
+                           self.identifier_symbols[index], None)
                 # Don't exit as other identifiers might not be repeated
-            elif (self.current_device.id == self.scanner.DTYPE_ID):
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.D_TYPE,
-                                                 self.current_number.id)
-                # Invalid device error already checked in device_type()
-                # so not checked for in any of the devices below
-                if (error == self.devices.QUALIFIER_PRESENT):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("DTYPE takes no number"), None)
-                    # Exit make_devices if error occured as devices
-                    # creation not valid for any of the identifiers
-                    return
-            elif (self.current_device.id == self.scanner.SWITCH_ID):
-                # Set default value to 0 if no value specified
-                if (self.current_number.id is None):
-                    self.current_number.id = 0
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.SWITCH,
-                                                 self.current_number.id)
-                if (error == self.devices.INVALID_QUALIFIER):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("SWITCH takes only 0 or 1"), None)
-                    return
-            elif (self.current_device.id == self.scanner.CLOCK_ID):
-                # Set default value to 1 if no value specified
-                if (self.current_number.id is None):
-                    self.current_number.id = 1
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.CLOCK,
-                                                 self.current_number.id)
-                # This error can only hapen with zero as trying to define a
-                # negative number will give a syntax error as - is invalid
-                if (error == self.devices.INVALID_QUALIFIER):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("CLOCK takes only values greater than 0"),
-                               None)
-                    return
-            elif (self.current_device.id == self.scanner.NAND_ID):
-                # Set default value to 2 if no value specified
-                if (self.current_number.id is None):
-                    self.current_number.id = 2
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.NAND,
-                                                 self.current_number.id)
-                if (error == self.devices.INVALID_QUALIFIER):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("NAND gates can only have 1 to 16 inputs"),
-                               None)
-                    return
-            elif (self.current_device.id == self.scanner.AND_ID):
-                # Set default value to 2 if no value specified
-                if (self.current_number.id is None):
-                    self.current_number.id = 2
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.AND,
-                                                 self.current_number.id)
-                if (error == self.devices.INVALID_QUALIFIER):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("AND gates can only have 1 to 16 inputs"),
-                               None)
-                    return
-            elif (self.current_device.id == self.scanner.NOR_ID):
-                # Set default value to 2 if no value specified
-                if (self.current_number.id is None):
-                    self.current_number.id = 2
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.NOR,
-                                                 self.current_number.id)
-                if (error == self.devices.INVALID_QUALIFIER):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("NOR gates can only have 1 to 16 inputs"),
-                               None)
-                    return
-            elif (self.current_device.id == self.scanner.OR_ID):
-                # Set default value to 2 if no value specified
-                if (self.current_number.id is None):
-                    self.current_number.id = 2
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.OR,
-                                                 self.current_number.id)
-                if (error == self.devices.INVALID_QUALIFIER):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("OR gates can only have 1 to 16 inputs"),
-                               None)
-                    return
-            elif (self.current_device.id == self.scanner.XOR_ID):
-                # XOR must have None in device_property
-                # If 2 specificied change to None
-                # Default value already None if no number assigned
-                if (self.current_number.id == 2):
-                    self.current_number.id = None
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.XOR,
-                                                 self.current_number.id)
-                # If number specificied not 2 an error raised
-                # as device_type wont be None
-                if (error == self.devices.QUALIFIER_PRESENT):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("XOR gates can only have 2 inputs"),
-                               None)
-                    return
-            elif (self.current_device.id == self.scanner.SIGGEN_ID):
-                error = self.devices.make_device(identifier.id,
-                                                 self.devices.SIGGEN,
-                                                 self.current_number.id)
-                if (error == self.devices.NO_QUALIFIER):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("SIGGEN requires a parameter to be"
-                                 "specified."), None)
-                    return
-                if (error == self.devices.INVALID_QUALIFIER):
-                    self.error(self.DEVICE_VALUE_ERROR,
-                               _("SIGGEN requires a 4 or 8 followed by a "
-                                 "binary number."), None)
-                    return
+                continue
+            error = self.devices.make_device(identifier_id, device_kind,
+                                             number)
+            if error in errors:
+                self.error(self.DEVICE_VALUE_ERROR, errors[error], None)
+                # Exit make_devices if error occured as devices
+                # creation not valid for any of the identifiers
+                return
 
     def make_connection(self):
         """" Create a connection between the inputs and ouputs specified.
@@ -886,7 +923,7 @@ class Parser:
         name, port = device_ip
         # Input ports of the form .IX have a number symbol for the port
         # The correct id for port .IX must be retrieved using the number
-        if (port.type == self.scanner.NUMBER):
+        if (port.type == self._NUMBER):
             input_name = "".join(["I", str(port.id)])
             [port.id] = self.names.lookup([input_name])
         return name.id, port.id
@@ -928,7 +965,7 @@ class Parser:
                        stopping_symbol=None)
 
     def get_error_codes(self):
-        """Return the error codes list generated while running
+        """Return the error codes generated while running
         parse_network().
 
         This method is used during unit testing to check
@@ -937,6 +974,6 @@ class Parser:
 
         Returns
         -------
-        A list of int, corresponding to the error codes.
+        A tuple of int, corresponding to the error codes.
         """
-        return self.error_codes
+        return tuple(self.error_codes)
@@ -26,6 +26,8 @@ class Symbol:
     No public methods.
     """
 
+    __slots__ = ('type', 'id', 'line', 'column')
+
     def __init__(self):
         """Initialise symbol properties."""
         self.type = None
@@ -58,9 +60,16 @@ class Scanner:
     get_symbol(self): Translates the next sequence of characters into a symbol
                       and returns the symbol.
 
+    tokenize_all(self): Translates the rest of the definition file into
+                        symbols and returns them as a list ending with the
+                        EOF symbol.
+
     get_error_line(self, symbol): Prints the line from the definition file
                             containing the symbol, and a marker pointing to its
                             position.
+
+    format_error_line(self, symbol): Returns what get_error_line prints, as a
+                            string.
     """
 
     def __init__(self, path, names):
@@ -274,9 +283,28 @@ class Scanner:
 
         return symbol
 
+    def tokenize_all(self):
+        """Translate the rest of the definition file into a list of symbols,
+        ending with the EOF symbol."""
+        symbols = []
+        append = symbols.append
+        get_symbol = self.get_symbol
+        EOF = self.EOF
+        symbol = get_symbol()
+        append(symbol)
+        while symbol.type != EOF:
+            symbol = get_symbol()
+            append(symbol)
+        return symbols
+
     def get_error_line(self, symbol):
         """Print the line from the definition file containing the symbol,
         and a marker pointing to its position."""
+        print(self.format_error_line(symbol))
+
+    def format_error_line(self, symbol):
+        """Return the line from the definition file containing the symbol,
+        and a marker pointing to its position, on two lines."""
         if not isinstance(symbol, Symbol):
             raise TypeError('symbol must be an instance of the class Symbol')
 
@@ -302,8 +330,8 @@ class Scanner:
         line_retrieved = self.fileIn.read(line_length)
         # replace tabs in line_retrieved with a single space for correct
         # printing to the terminal
-        print(line_retrieved.expandtabs(1))
-        print(" "*(symbol.column - 1) + "^")  # pointer to the symbol
+        error_line = (line_retrieved.expandtabs(1) + "\n" +
+                      " "*(symbol.column - 1) + "^")  # pointer to the symbol
 
         # restore state of the scanner
         self.fileIn.seek(current_pos, 0)
@@ -311,3 +339,4 @@ class Scanner:
         self.current_character = current_ch
         self.current_line_pos = current_line_pos
         self.line_pos_record = line_record.copy()
+        return error_line
@@ -38,6 +38,16 @@ def test_get_device(devices_with_items):
         assert devices_with_items.get_device(X_ID) is None
 
 
+def test_has_device(devices_with_items):
+    """Test if has_device returns True only for existing devices."""
+    names = devices_with_items.names
+    for device in devices_with_items.devices_list:
+        assert devices_with_items.has_device(device.device_id)
+
+    [X_ID] = names.lookup(["Random_non_device"])
+    assert not devices_with_items.has_device(X_ID)
+
+
 def test_find_devices(devices_with_items):
     """Test if find_devices returns the correct devices of the given kind."""
     devices = devices_with_items
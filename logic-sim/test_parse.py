@@ -82,12 +82,15 @@ def new_parser(filename):
     ("test_syntax_missing_devs_1.txt", False, [Parser.SYNTAX_ERROR] * 2),
     ("test_syntax_missing_devs_2.txt", False, [Parser.SYNTAX_ERROR] * 2),
     ("test_syntax_missing_devs_3.txt", False, [Parser.SYNTAX_ERROR] * 2),
+    ("test_syntax_missing_devs_semicolon.txt", False,
+        [Parser.SYNTAX_ERROR] * 2),
     ("test_syntax_missing_mons_1.txt", False, [Parser.SYNTAX_ERROR]),
     ("test_syntax_missing_mons_2.txt", False, [Parser.SYNTAX_ERROR] * 2),
     ("test_syntax_missing_mons_3.txt", False, [Parser.SYNTAX_ERROR]),
     ("test_syntax_mon_def_missing_comma.txt", False, [Parser.SYNTAX_ERROR]),
     ("test_syntax_mon_def_missing_semicolon.txt", False,
         [Parser.SYNTAX_ERROR]),
+    ("test_syntax_mon_after_end.txt", False, [Parser.SYNTAX_ERROR]),
     ("test_syntax_no_devices.txt", False,
         [Parser.KEYWORD_ERROR, Parser.SYNTAX_ERROR]),
     ("test_syntax_wrong_symbol.txt", False, [Parser.SYNTAX_ERROR]),
@@ -97,4 +100,21 @@ def test_parse(new_parser, success, error_list):
     value and identifies the corresponding errors.
     """
     assert new_parser.parse_network() == success
-    assert new_parser.get_error_codes() == error_list
+    assert new_parser.get_error_codes() == tuple(error_list)
+
+
+@pytest.mark.parametrize("filename", ["test_syntax_invalid_names.txt"])
+def test_parse_max_errors(new_parser):
+    """Test that Parser.parse_network() stops after max_errors errors."""
+    new_parser.max_errors = 1
+    assert not new_parser.parse_network()
+    assert new_parser.get_error_codes() == (Parser.SYNTAX_ERROR,)
+
+
+@pytest.mark.parametrize("filename", ["test_syntax_invalid_names.txt"])
+@pytest.mark.parametrize("max_errors", [0, -1])
+def test_parse_max_errors_invalid(new_parser, max_errors):
+    """Test that Parser.parse_network() rejects max_errors below 1."""
+    new_parser.max_errors = max_errors
+    with pytest.raises(ValueError):
+        new_parser.parse_network()
@@ -386,3 +386,31 @@ def test_get_symbol_port_inputs(new_Scanner, new_file):
     expected_output = [scanner.PORT, scanner.NUMBER, scanner.EOF]
     for output in expected_output:
         assert scanner.get_symbol().type == output
+
+
+def test_tokenize_all(new_Scanner, new_file):
+    """Test tokenize_all returns the same symbols as get_symbol, up to and
+    including EOF."""
+    data = "DEVICES: A, B := AND(2); // comment\nCONNECTIONS: A => B.I1;"
+    expected = []
+    scanner = new_Scanner(new_file(data))
+    symbol = scanner.get_symbol()
+    expected.append((symbol.type, symbol.id, symbol.line, symbol.column))
+    while symbol.type != scanner.EOF:
+        symbol = scanner.get_symbol()
+        expected.append((symbol.type, symbol.id, symbol.line, symbol.column))
+
+    scanner = new_Scanner(new_file(data))
+    symbols = scanner.tokenize_all()
+    assert [(symbol.type, symbol.id, symbol.line, symbol.column)
+            for symbol in symbols] == expected
+    assert new_Scanner(new_file("")).tokenize_all()[0].type == scanner.EOF
+
+
+def test_format_error_line(new_Scanner, new_file):
+    """Test format_error_line returns the line of the symbol and a marker
+    under it."""
+    scanner = new_Scanner(new_file("DEVICES:\n  A := AND;\nEND;"))
+    symbols = scanner.tokenize_all()
+    # symbols[4] is AND
+    assert scanner.format_error_line(symbols[4]) == "  A := AND;\n       ^"